@@ -0,0 +1,39 @@
+"""
+Compares two result files written by `run.py`.
+
+    python benchmarks/compare.py before.json after.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('before', type=Path)
+    parser.add_argument('after', type=Path)
+    parser.add_argument('--metric', default='p50_ms', choices=['mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+    args = parser.parse_args()
+
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+
+    print(f'before: {before["meta"].get("commit")}')
+    print(f'after:  {after["meta"].get("commit")}')
+    print()
+    print(f'{"scenario":<32} {"before":>10} {"after":>10} {"change":>9}')
+
+    for name, result in before['results'].items():
+        if name not in after['results']:
+            continue
+
+        old = result[args.metric]
+        new = after['results'][name][args.metric]
+        change = (new - old) / old * 100 if old else 0
+
+        print(f'{name:<32} {old:10.3f} {new:10.3f} {change:+8.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Memory benchmark for renderables.
+
+Reports how many bytes each renderable takes when N of them are alive at once, and how much memory
+is allocated per frame when N one-shot renderables are created with their constructor vs with
+`Renderable.acquire`:
+
+    python benchmarks/memory.py
+    python benchmarks/memory.py --count 10000 --output memory.json
+"""
+
+import os
+
+# must be set before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from bpgwrapper import Circle, Color, Game, Rectangle, Renderable, Vector2
+
+COLOR = Color(200, 80, 40)
+
+Factory = Callable[[Game, Vector2], Renderable]
+
+
+def circle(game: Game, pos: Vector2) -> Renderable:
+    return Circle(game, pos, 0.1, COLOR)
+
+
+def rectangle(game: Game, pos: Vector2) -> Renderable:
+    return Rectangle(game, pos, 0.1, 0.1, COLOR)
+
+
+def pooled_circle(game: Game, pos: Vector2) -> Renderable:
+    return Circle.acquire(game, pos, 0.1, COLOR)
+
+
+def resident_bytes(game: Game, factory: Factory, count: int) -> float:
+    # positions are allocated up front, since they belong to whatever owns the renderable
+    positions = [Vector2(i % 100, i // 100) for i in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+
+    renderables = [factory(game, pos) for pos in positions]
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    # minus the list holding them
+    return (size - sys.getsizeof(renderables)) / count
+
+
+def transient_frame(game: Game, factory: Factory, count: int, frames: int) -> dict[str, float]:
+    positions = [Vector2(i % 100, i // 100) for i in range(count)]
+
+    def frame() -> None:
+        for pos in positions:
+            factory(game, pos).render()
+
+        game.step()
+
+    # the first frame fills the pool, if there's one
+    frame()
+    gc.collect()
+
+    tracemalloc.start()
+    frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    start = perf_counter_ns()
+
+    for _ in range(frames):
+        frame()
+
+    elapsed = perf_counter_ns() - start
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+
+    return {
+        'peak_bytes_per_frame': peak,
+        'gc_collections_per_frame': collections / frames,
+        'mean_ms': elapsed / frames / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100_000, help='renderables alive at once')
+    parser.add_argument('--transient', type=int, default=10_000, help='one-shot renderables per frame')
+    parser.add_argument('--frames', type=int, default=30, help='measured frames for the transient scenarios')
+    parser.add_argument('--output', '-o', type=Path, help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    game = Game()
+    game.time.target_framerate = None
+    game.on_start.invoke()
+
+    results: dict[str, Any] = {}
+
+    for name, factory in (('circle', circle), ('rectangle', rectangle)):
+        key = f'resident_{name}[n={args.count}]'
+        results[key] = {'bytes_per_renderable': resident_bytes(game, factory, args.count)}
+        print(f'{key:<40} {results[key]["bytes_per_renderable"]:8.1f} bytes per renderable')
+
+    for name, factory in (('new', circle), ('acquire', pooled_circle)):
+        key = f'transient_{name}[n={args.transient}]'
+        results[key] = transient_frame(game, factory, args.transient, args.frames)
+
+        r = results[key]
+        print(
+            f'{key:<40} {r["peak_bytes_per_frame"] / 1024:8.1f} KiB peak   '
+            f'{r["gc_collections_per_frame"]:6.1f} GC runs   {r["mean_ms"]:8.3f} ms per frame'
+        )
+
+    pygame.quit()
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
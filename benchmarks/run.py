@@ -0,0 +1,278 @@
+"""
+Headless benchmark suite for the engine's hot paths.
+
+Runs every scenario under SDL's dummy video driver and writes frame-time percentiles to JSON, so
+that two commits can be compared with `compare.py`:
+
+    python benchmarks/run.py --output before.json
+    git checkout other-commit
+    python benchmarks/run.py --output after.json
+    python benchmarks/compare.py before.json after.json
+"""
+
+import os
+
+# must be set before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from bpgwrapper import Circle, Color, Game, Rectangle, Vector2
+from bpgwrapper._systems import BoxCollider, CircleCollider
+from bpgwrapper.recording import InputPlayer
+from bpgwrapper.types import Coroutine
+from bpgwrapper.utils import summarize
+
+
+# a scenario sets up a game and returns the work done each frame. the optional second callable
+# runs before every frame without being timed, e.g. to post synthetic events.
+Frame = Callable[[], None]
+Scenario = Callable[[Game, int], tuple[Frame, Frame | None]]
+
+SEED = 1234
+
+
+def circles(antialiasing: bool) -> Scenario:
+    def scenario(game: Game, n: int) -> tuple[Frame, Frame | None]:
+        for _ in range(n):
+            circle = Circle(
+                game,
+                game.window.random_position(),
+                random.uniform(0.05, 0.5),
+                Color(200, 80, 40),
+                antialiasing=antialiasing
+            )
+            circle.always_render = True
+
+        return game.step, None
+
+    return scenario
+
+
+def rectangles(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    for _ in range(n):
+        rectangle = Rectangle(
+            game,
+            game.window.random_position(),
+            random.uniform(0.1, 1),
+            random.uniform(0.1, 1),
+            Color(40, 80, 200),
+            Color(0, 0, 0)
+        )
+        rectangle.always_render = True
+
+    return game.step, None
+
+
+def keyboard_flood(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    keys = [pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_SPACE, pygame.K_LSHIFT]
+
+    def post() -> None:
+        for i in range(n):
+            key = keys[i % len(keys)]
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN if i % 2 == 0 else pygame.KEYUP, key=key))
+
+    def frame() -> None:
+        game.events.update()
+        game.keyboard.update()
+
+    return frame, post
+
+
+def mouse_flood(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    def post() -> None:
+        for i in range(n):
+            pygame.event.post(pygame.event.Event(
+                pygame.MOUSEMOTION,
+                pos=(i % 640, i % 480),
+                rel=(1, 1),
+                buttons=(0, 0, 0)
+            ))
+
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0)))
+        pygame.event.post(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1))
+
+    def frame() -> None:
+        game.events.update()
+        game.mouse.update()
+        game.mouse.scroll_delta
+
+    return frame, post
+
+
+def scheduling(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    def coroutine() -> Coroutine:
+        while True:
+            yield None
+
+    for _ in range(n):
+        game.scheduling.start_coroutine(coroutine())
+
+    def frame() -> None:
+        game.scheduling.update()
+        # `WaitForFrames` depends on the frame count, which is advanced by `Time.post_update`
+        game.time._frame_count += 1
+
+    return frame, None
+
+
+def camera_conversions(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    points = [Vector2(random.uniform(-50, 50), random.uniform(-50, 50)) for _ in range(n)]
+    camera = game.camera
+
+    def frame() -> None:
+        for point in points:
+            camera.pixel_to_world_pos(camera.world_to_pixel_pos(point))
+            camera.world_to_pixel_scale(point.x)
+
+    return frame, None
+
+
+def collision(game: Game, n: int) -> tuple[Frame, Frame | None]:
+    colliders = []
+
+    for i in range(n):
+        pos = Vector2(random.uniform(-100, 100), random.uniform(-100, 100))
+
+        if i % 2:
+            collider = CircleCollider(pos, random.uniform(0.1, 1))
+        else:
+            collider = BoxCollider(pos, random.uniform(0.1, 2), random.uniform(0.1, 2))
+
+        colliders.append(game.collision.add(collider))
+
+    def frame() -> None:
+        for collider in colliders:
+            collider.pos.x += random.uniform(-0.1, 0.1)
+
+        game.collision.update()
+
+    return frame, None
+
+
+def replay(path: Path) -> Scenario:
+    # replays a recording made with `InputRecorder`, driving the game with recorded input
+    def scenario(game: Game, n: int) -> tuple[Frame, Frame | None]:
+        InputPlayer(game, path, loop=True)
+        return game.step, None
+
+    return scenario
+
+
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    'circles_aa': (circles(True), 2_000),
+    'circles_no_aa': (circles(False), 2_000),
+    'rectangles': (rectangles, 2_000),
+    'keyboard_flood': (keyboard_flood, 500),
+    'mouse_flood': (mouse_flood, 500),
+    'scheduling': (scheduling, 10_000),
+    'camera_conversions': (camera_conversions, 10_000),
+    'collision': (collision, 5_000),
+}
+
+
+def run_scenario(scenario: Scenario, n: int, frames: int, warmup: int) -> list[int]:
+    random.seed(SEED)
+
+    game = Game()
+    # benchmarks measure work, not the frame limiter
+    game.time.target_framerate = None
+    game.on_start.invoke()
+
+    frame, setup = scenario(game, n)
+    samples = []
+
+    try:
+        for i in range(warmup + frames):
+            if setup is not None:
+                setup()
+
+            start = perf_counter_ns()
+            frame()
+            elapsed = perf_counter_ns() - start
+
+            if i >= warmup:
+                samples.append(elapsed)
+    finally:
+        pygame.quit()
+
+    return samples
+
+
+def summarize_frames(samples: list[int]) -> dict[str, float]:
+    # the same statistics as `Profiler.summary`, in milliseconds
+    return {'frames': len(samples), **{f'{name}_ms': value for name, value in summarize(samples, scale=1e-6).items()}}
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+        'platform': platform.platform(),
+        'video_driver': os.environ['SDL_VIDEODRIVER'],
+    }
+
+
+def selected(patterns: list[str]) -> Iterator[tuple[str, Scenario, int]]:
+    for name, (scenario, n) in SCENARIOS.items():
+        if not patterns or any(fnmatch(name, pattern) for pattern in patterns):
+            yield name, scenario, n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenarios', nargs='*', help='glob patterns of the scenarios to run (all by default)')
+    parser.add_argument('--frames', type=int, default=300, help='measured frames per scenario')
+    parser.add_argument('--warmup', type=int, default=30, help='unmeasured frames before measuring')
+    parser.add_argument('--scale', type=float, default=1, help='multiplier for every scenario\'s N')
+    parser.add_argument('--output', '-o', type=Path, help='JSON file to write the results to')
+    parser.add_argument('--replay', type=Path, help='input recording to add as a `replay` scenario')
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        SCENARIOS['replay'] = (replay(args.replay), 1)
+
+    results = {}
+
+    for name, scenario, n in selected(args.scenarios):
+        n = max(1, int(n * args.scale))
+        key = f'{name}[n={n}]'
+
+        results[key] = summarize_frames(run_scenario(scenario, n, args.frames, args.warmup))
+
+        r = results[key]
+        print(f'{key:<32} p50 {r["p50_ms"]:8.3f} ms   p95 {r["p95_ms"]:8.3f} ms   p99 {r["p99_ms"]:8.3f} ms')
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({'meta': metadata(), 'results': results}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup benchmark.
+
+Measures, in a fresh interpreter each time, how long it takes to import the package and create a
+`Game` for a few configurations, e.g. a full game vs a minimal headless simulation worker:
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 50 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> systems passed to `Game`, `None` being the default (everything)
+CONFIGURATIONS: dict[str, Optional[list[str]]] = {
+    'default': None,
+    'headless': ['time', 'scheduling', 'collision'],
+    'input': ['time', 'keyboard'],
+}
+
+# runs in the child interpreter, and prints the import and `Game` creation times in ms
+PROGRAM = """
+import sys
+from time import perf_counter_ns
+
+start = perf_counter_ns()
+from bpgwrapper import Game
+imported = perf_counter_ns()
+Game(systems={systems!r})
+created = perf_counter_ns()
+
+print((imported - start) / 1e6, (created - imported) / 1e6, len(sys.modules))
+"""
+
+
+def measure(systems: Optional[list[str]]) -> tuple[float, float, int]:
+    env = {
+        **os.environ,
+        'SDL_VIDEODRIVER': 'dummy',
+        'SDL_AUDIODRIVER': 'dummy',
+        'PYGAME_HIDE_SUPPORT_PROMPT': '1',
+        'PYTHONPATH': str(ROOT),
+    }
+
+    output = subprocess.run(
+        [sys.executable, '-c', PROGRAM.format(systems=systems)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True
+    ).stdout.split()
+
+    return float(output[0]), float(output[1]), int(output[2])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20, help='fresh interpreters per configuration')
+    parser.add_argument('--output', '-o', type=Path, help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    results = {}
+
+    for name, systems in CONFIGURATIONS.items():
+        samples = [measure(systems) for _ in range(args.runs)]
+
+        import_ms = statistics.median(s[0] for s in samples)
+        game_ms = statistics.median(s[1] for s in samples)
+
+        results[name] = {
+            'systems': systems,
+            'import_ms': import_ms,
+            'game_ms': game_ms,
+            'total_ms': import_ms + game_ms,
+            'modules': samples[0][2],
+        }
+
+        print(
+            f'{name:<10} import {import_ms:8.2f} ms   Game() {game_ms:8.2f} ms   '
+            f'total {import_ms + game_ms:8.2f} ms   {samples[0][2]} modules'
+        )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
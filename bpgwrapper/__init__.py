@@ -1,6 +1,7 @@
 from .backgrounds import ColorBackground, ImageBackground
 from .core import Component, System
 from .game import Game
+from .input_map import InputMap
 from .renderables import *
 from .yieldables import *
 from .types import *
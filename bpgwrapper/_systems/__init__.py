@@ -1,8 +1,92 @@
-from .camera import Camera
-from .events import Events
-from .keyboard import Keyboard
-from .mouse import Mouse
-from .rendering import Rendering
-from .scheduling import Scheduling
-from .time import Time
-from .window import Window
+from importlib import import_module
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from ..core import System
+    from .camera import Camera
+    from .collision import BoxCollider, CircleCollider, Collider, Collision
+    from .events import Events
+    from .keyboard import Keyboard
+    from .mouse import Mouse
+    from .rendering import Rendering
+    from .scheduling import Scheduling
+    from .time import Time
+    from .window import Window
+
+
+__all__ = [
+    'BoxCollider', 'Camera', 'CircleCollider', 'Collider', 'Collision', 'Events', 'Keyboard',
+    'Mouse', 'Rendering', 'Scheduling', 'Time', 'Window'
+]
+
+# the built-in systems, by their attribute name in `Game`: (module, class). what each one needs and
+# when it runs are declared by the systems themselves (see `System`). this is the order they're
+# created in, which is also their order within a phase unless they say otherwise.
+SYSTEMS: dict[str, tuple[str, str]] = {
+    'time': ('time', 'Time'),
+    'events': ('events', 'Events'),
+    'scheduling': ('scheduling', 'Scheduling'),
+    'mouse': ('mouse', 'Mouse'),
+    'keyboard': ('keyboard', 'Keyboard'),
+    'collision': ('collision', 'Collision'),
+    'camera': ('camera', 'Camera'),
+    'rendering': ('rendering', 'Rendering'),
+    'window': ('window', 'Window'),
+}
+
+# where each name in `__all__` is defined, so that they're only imported when used
+_MODULES = {
+    'BoxCollider': 'collision',
+    'CircleCollider': 'collision',
+    'Collider': 'collision',
+    **{cls: module for module, cls in SYSTEMS.values()},
+}
+
+
+def resolve_systems(names: Optional[Iterable[str]] = None) -> list[type['System']]:
+    """
+    Returns the built-in systems needed for a configuration, i.e. `names` and everything they
+    require, in the order they must be created in.\n
+    Only the modules of those systems are imported.
+
+    Parameters
+    ----------
+    names : `Optional[Iterable[str]], optional`
+        The names of the systems, as in `SYSTEMS`. All of them by default.
+
+    Returns
+    -------
+    `list[type[System]]`
+        The classes of the systems to create.
+
+    Raises
+    ------
+    `ValueError`
+        If a name isn't a built-in system.
+    """
+    pending = list(SYSTEMS if names is None else names)
+    needed: dict[str, type['System']] = {}
+
+    while pending:
+        name = pending.pop()
+
+        if name not in SYSTEMS:
+            raise ValueError(f'Unknown system "{name}"! Expected one of {", ".join(SYSTEMS)}.')
+
+        if name not in needed:
+            needed[name] = load_system(name)
+            pending.extend(needed[name].requires)
+
+    return [needed[name] for name in SYSTEMS if name in needed]
+
+
+def load_system(name: str) -> type['System']:
+    module, cls = SYSTEMS[name]
+    return getattr(import_module(f'.{module}', __name__), cls)  # type: ignore
+
+
+def __getattr__(name: str) -> type:
+    if name in _MODULES:
+        return getattr(import_module(f'.{_MODULES[name]}', __name__), name)  # type: ignore
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Tuple
 
 from pygame.math import Vector2, Vector3
 
@@ -11,11 +11,28 @@ if TYPE_CHECKING:
 PositionType = Literal['world', 'pixel']
 
 
+# pixel units are the pixels of `Window.surface`, which are fewer than the window's when there's a
+# `Window.render_scale`
 class Camera(System):
+    requires = ('window',)
+
     def __init__(self, game: 'Game'):
         super().__init__(game)
 
-        self.pos = Vector3(0, 0, 1)
+        self._pos = Vector3(0, 0, 1)
+
+    @property
+    def pos(self) -> Vector3:
+        """
+        The camera's position, and its zoom as `z`.\n
+        Setting it invalidates `frame_cached` properties, which changing it in place doesn't do.
+        """
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos: Vector3) -> None:
+        self._pos = pos
+        self._game.invalidate_frame_cache()
 
     def pixel_to_world_pos(self, pos: Vector2) -> Vector2:
         """
@@ -31,7 +48,7 @@ class Camera(System):
         `Vector2`
             The converted position.
         """
-        return self._invert_y(pos - self._game.window.center_pixel_pos) / (self._game.window.size // 10).x + self.pos.xy
+        return self._invert_y(pos - self._game.window.center_pixel_pos) / (self._game.window.render_size // 10).x + self._pos.xy
 
     def pixel_to_world_scale(self, scale: float) -> float:
         """
@@ -47,7 +64,7 @@ class Camera(System):
         `float`
             The converted scale.
         """
-        return scale / self.pos.z / 10 / (self._game.window.size // 200).x
+        return scale / self._pos.z / 10 / (self._game.window.render_size.x // 200)
 
     def world_to_pixel_pos(self, pos: Vector2) -> Vector2:
         """
@@ -63,7 +80,29 @@ class Camera(System):
         `Vector2`
             The converted position.
         """
-        return self._invert_y(pos - self.pos.xy) * (self._game.window.size // 10).x + self._game.window.center_pixel_pos
+        return self._invert_y(pos - self._pos.xy) * (self._game.window.render_size // 10).x + self._game.window.center_pixel_pos
+
+    def world_to_pixel_xy(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Same as `world_to_pixel_pos`, but with plain floats instead of `Vector2`s, so that hot paths
+        (e.g. drawing) don't allocate any vectors.
+
+        Parameters
+        ----------
+        x : `float`
+            The x component of the position to be converted.
+        y : `float`
+            The y component of the position to be converted.
+
+        Returns
+        -------
+        `Tuple[float, float]`
+            The converted position.
+        """
+        size = self._game.window.render_size
+        unit = size.x // 10
+
+        return (x - self._pos.x) * unit + size.x // 2, (self._pos.y - y) * unit + size.y // 2
 
     def world_to_pixel_scale(self, scale: float) -> float:
         """
@@ -79,7 +118,7 @@ class Camera(System):
         `float`
             The converted scale.
         """
-        return scale * self.pos.z * 10 * (self._game.window.size // 200).x
+        return scale * self._pos.z * 10 * (self._game.window.render_size.x // 200)
 
     def is_circle_visible(self, pos: Vector2, radius: float, pos_type: PositionType='pixel') -> bool:
         """
@@ -100,7 +139,7 @@ class Camera(System):
         `bool`
             Whether or not the circle is visible.
         """
-        window_size = self._game.window.size
+        window_size = self._game.window.render_size
 
         if pos_type == 'world':
             pos = self.world_to_pixel_pos(pos)
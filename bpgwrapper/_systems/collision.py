@@ -0,0 +1,240 @@
+from dataclasses import KW_ONLY, dataclass, field
+from itertools import count
+from typing import TYPE_CHECKING, Any, Callable, Literal
+
+from pygame.math import Vector2
+
+from ..core import System
+from ..event import Event
+
+if TYPE_CHECKING:
+    from ..game import Game
+    from ..renderables import Circle, Rectangle
+
+
+ALL_LAYERS = 0xFFFFFFFF
+
+_ids = count()
+
+
+@dataclass(eq=False)
+class Collider:
+    pos: Vector2
+    _: KW_ONLY
+    # which of the 32 layers this collider is in, and a bitmask of the layers it collides with.
+    # two colliders only collide if each one's mask contains the other's layer.
+    layer: int = 0
+    mask: int = ALL_LAYERS
+    # anything the game wants to associate with this collider, e.g. its component
+    data: Any = None
+    _id: int = field(default_factory=lambda: next(_ids), init=False, repr=False)
+
+
+@dataclass(eq=False)
+class CircleCollider(Collider):
+    radius: float
+
+    @classmethod
+    def of(cls, circle: 'Circle', **kwargs: Any) -> 'CircleCollider':
+        """
+        Creates a collider with the same shape as `circle`, sharing its `pos` vector.
+        """
+        return cls(circle.pos, circle.radius, **kwargs)
+
+
+@dataclass(eq=False)
+class BoxCollider(Collider):
+    width: float
+    height: float
+    _: KW_ONLY
+    # same as `Rectangle.rect_mode`
+    rect_mode: Literal['center', 'top_right'] = 'center'
+
+    @classmethod
+    def of(cls, rectangle: 'Rectangle', **kwargs: Any) -> 'BoxCollider':
+        """
+        Creates a collider with the same shape as `rectangle`, sharing its `pos` vector.
+        """
+        return cls(rectangle.pos, rectangle.width, rectangle.height, rect_mode=rectangle.rect_mode, **kwargs)
+
+
+CollisionEvent = Callable[[Collider, Collider], None]
+
+
+class Collision(System):
+    """
+    Detects overlaps between `CircleCollider`s and `BoxCollider`s once per frame, and reports
+    them through `on_enter`, `on_stay` and `on_exit`.\n
+    Pairs are found with a sweep-and-prune broadphase along the x axis, then filtered by layer
+    and tested exactly, all vectorized with NumPy (which is only required once colliders are added).
+    """
+
+    def __init__(self, game: 'Game') -> None:
+        super().__init__(game)
+
+        self._colliders: dict[int, Collider] = {}
+        # pairs that were touching last frame, as `_pair_key`s
+        self._contacts: set[int] = set()
+        # pairs that stopped touching this frame, whose `on_exit` hasn't been invoked yet
+        self._exiting: set[int] = set()
+
+        self.on_enter = Event[CollisionEvent]()
+        self.on_stay = Event[CollisionEvent]()
+        self.on_exit = Event[CollisionEvent]()
+
+    @property
+    def colliders(self) -> list[Collider]:
+        return list(self._colliders.values())
+
+    def add(self, collider: Collider) -> Collider:
+        self._colliders[collider._id] = collider
+        return collider
+
+    def remove(self, collider: Collider) -> None:
+        """
+        Removes a collider, invoking `on_exit` for everything it was touching.\n
+        Doesn't raise exception if the collider wasn't added. Can be called from collision
+        handlers, in which case the collider's pairs that weren't dispatched yet are skipped.
+        """
+        if self._colliders.pop(collider._id, None) is None:
+            return
+
+        touching = self._contacts | self._exiting
+
+        for key in [key for key in touching if collider._id in _unpack_key(key)]:
+            self._contacts.discard(key)
+            self._exiting.discard(key)
+            a, b = _unpack_key(key)
+            other = self._colliders[b if a == collider._id else a]
+            self.on_exit.invoke(collider, other)
+
+    def update(self) -> None:
+        contacts = self._find_contacts() if len(self._colliders) > 1 else set()
+
+        colliders = self._colliders
+        previous = self._contacts
+        self._contacts = contacts
+
+        # handlers can remove colliders, which takes their pairs out of `_contacts` and
+        # `_exiting`, so pairs are checked against those right before being dispatched
+        self._exiting = previous - contacts
+
+        for key in contacts - previous:
+            if key in contacts:
+                a, b = _unpack_key(key)
+                self.on_enter.invoke(colliders[a], colliders[b])
+
+        if len(self.on_stay):
+            for key in contacts & previous:
+                if key in contacts:
+                    a, b = _unpack_key(key)
+                    self.on_stay.invoke(colliders[a], colliders[b])
+
+        exiting = self._exiting
+
+        while exiting:
+            a, b = _unpack_key(exiting.pop())
+            self.on_exit.invoke(colliders[a], colliders[b])
+
+    def _find_contacts(self) -> set[int]:
+        import numpy as np
+
+        colliders = list(self._colliders.values())
+
+        is_circle = np.array([isinstance(c, CircleCollider) for c in colliders])
+        layer = np.array([c.layer for c in colliders], dtype=np.int64)
+        mask = np.array([c.mask for c in colliders], dtype=np.int64)
+
+        # layers that nothing wants to collide with are skipped before doing any geometry at all
+        present = int(np.bitwise_or.reduce(np.int64(1) << layer))
+        wanted = int(np.bitwise_or.reduce(mask))
+        relevant = ((mask & present) != 0) & (((np.int64(1) << layer) & wanted) != 0)
+
+        if np.count_nonzero(relevant) < 2:
+            return set()
+
+        index = np.flatnonzero(relevant)
+        colliders = [colliders[i] for i in index.tolist()]
+        is_circle = is_circle[index]
+        layer = layer[index]
+        mask = mask[index]
+
+        # centers and half extents, which are also the bounding boxes of circles
+        shapes = np.array([_center_and_half_extents(c) for c in colliders], dtype=np.float64)
+        x, y, hx, hy = shapes.T
+        ids = np.array([c._id for c in colliders], dtype=np.int64)
+
+        # sweep and prune: after sorting by the left edges, everything whose left edge is between a
+        # box's left and right edges overlaps it on the x axis
+        min_x = x - hx
+        order = np.argsort(min_x, kind='stable')
+        sorted_min_x = min_x[order]
+        ends = np.searchsorted(sorted_min_x, (x + hx)[order], side='right')
+
+        n = len(order)
+        counts = np.maximum(ends - np.arange(n) - 1, 0)
+        total = int(counts.sum())
+
+        if not total:
+            return set()
+
+        first = np.repeat(np.arange(n), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        a = order[first]
+        b = order[first + 1 + offsets]
+
+        keep = (np.abs(y[a] - y[b]) <= hy[a] + hy[b])
+        keep &= ((mask[a] >> layer[b]) & 1).astype(bool) & ((mask[b] >> layer[a]) & 1).astype(bool)
+        a = a[keep]
+        b = b[keep]
+
+        # narrowphase. box-box pairs already overlap, since their bounding boxes are exact.
+        circle_a = is_circle[a]
+        circle_b = is_circle[b]
+
+        dx = x[a] - x[b]
+        dy = y[a] - y[b]
+        radii = hx[a] + hx[b]
+        circles_touch = dx * dx + dy * dy <= radii * radii
+
+        # for circle-box pairs, the closest point of the box to the circle's center
+        circle = np.where(circle_a, a, b)
+        box = np.where(circle_a, b, a)
+        cx = np.clip(x[circle], x[box] - hx[box], x[box] + hx[box]) - x[circle]
+        cy = np.clip(y[circle], y[box] - hy[box], y[box] + hy[box]) - y[circle]
+        circle_box_touch = cx * cx + cy * cy <= hx[circle] * hx[circle]
+
+        touching = np.where(
+            circle_a & circle_b,
+            circles_touch,
+            np.where(circle_a | circle_b, circle_box_touch, True)
+        )
+
+        id_a = ids[a[touching]]
+        id_b = ids[b[touching]]
+
+        return set((
+            (np.minimum(id_a, id_b) << 32) | np.maximum(id_a, id_b)
+        ).tolist())
+
+
+def _center_and_half_extents(collider: Collider) -> tuple[float, float, float, float]:
+    pos = collider.pos
+
+    if isinstance(collider, CircleCollider):
+        return pos.x, pos.y, collider.radius, collider.radius
+
+    assert isinstance(collider, BoxCollider)
+
+    hx = collider.width / 2
+    hy = collider.height / 2
+
+    if collider.rect_mode == 'center':
+        return pos.x, pos.y, hx, hy
+
+    # `pos` is the top left corner on screen, and the world's y axis points up
+    return pos.x + hx, pos.y - hy, hx, hy
+
+
+def _unpack_key(key: int) -> tuple[int, int]:
+    return key >> 32, key & 0xFFFFFFFF
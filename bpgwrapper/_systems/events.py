@@ -1,46 +1,230 @@
-from typing import TYPE_CHECKING, Iterator, Optional
+from typing import TYPE_CHECKING, Hashable, Iterator, Optional
 
 import pygame
 from pygame.event import Event
 
 from ..core import System
-from ..utils import filter_by_attrs, get_by_attrs
 
 if TYPE_CHECKING:
     from ..game import Game
 
 
+# events that are blocked at the SDL level, and as such never queued nor converted to python objects,
+# while nothing is subscribed to them. event types that aren't listed here are never blocked.
+BLOCKABLE_EVENTS = frozenset({
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.TEXTINPUT,
+    pygame.TEXTEDITING,
+    pygame.FINGERDOWN,
+    pygame.FINGERUP,
+    pygame.FINGERMOTION,
+    pygame.MULTIGESTURE,
+    pygame.JOYAXISMOTION,
+    pygame.JOYBALLMOTION,
+    pygame.JOYHATMOTION,
+    pygame.JOYBUTTONDOWN,
+    pygame.JOYBUTTONUP,
+    pygame.CONTROLLERAXISMOTION,
+    pygame.CONTROLLERBUTTONDOWN,
+    pygame.CONTROLLERBUTTONUP,
+    pygame.CONTROLLERSENSORUPDATE,
+    pygame.CONTROLLERTOUCHPADDOWN,
+    pygame.CONTROLLERTOUCHPADMOTION,
+    pygame.CONTROLLERTOUCHPADUP,
+    pygame.DROPBEGIN,
+    pygame.DROPCOMPLETE,
+    pygame.DROPFILE,
+    pygame.DROPTEXT,
+    pygame.AUDIODEVICEADDED,
+    pygame.AUDIODEVICEREMOVED,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWHIDDEN,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWMOVED,
+    pygame.WINDOWSIZECHANGED,
+    pygame.WINDOWMINIMIZED,
+    pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWENTER,
+    pygame.WINDOWLEAVE,
+    pygame.WINDOWTAKEFOCUS,
+    pygame.WINDOWHITTEST,
+    pygame.ACTIVEEVENT,
+    pygame.VIDEOEXPOSE,
+    pygame.VIDEORESIZE,
+})
+
+
 class Events(System):
+    pygame_modules = ('display',)
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
         self.events: list[Event] = []
+        # built once per frame so that looking up events by type doesn't have to scan every event
+        self._events_by_type: dict[int, list[Event]] = {}
+
+        # event type -> whatever needs that type of event
+        self._subscriptions: dict[int, set[Hashable]] = {}
+        self._blocked: frozenset[int] = frozenset()
+        self._filtering = True
+        self._text_input = False
+
+        # how many frames an on-demand subscription (see `_subscribe_on_demand`) lasts after its
+        # event type was last looked up
+        self.on_demand_frames = 60
+        # event type -> the frame it was last looked up in, for on-demand subscriptions
+        self._on_demand: dict[int, int] = {}
+        self._frame = 0
+
+        # SDL starts text input by default, which fires TEXTINPUT events for every key press
+        pygame.key.stop_text_input()
+        self._update_blocked()
+
+    @property
+    def filtering(self) -> bool:
+        """
+        Whether event types in `BLOCKABLE_EVENTS` that nothing is subscribed to are blocked.
+        """
+        return self._filtering
+
+    @filtering.setter
+    def filtering(self, value: bool) -> None:
+        self._filtering = value
+        self._update_blocked()
+
+    @property
+    def text_input(self) -> bool:
+        return self._text_input
+
+    @text_input.setter
+    def text_input(self, value: bool) -> None:
+        self._text_input = value
+
+        if value:
+            pygame.key.start_text_input()
+            self.subscribe(pygame.TEXTINPUT, self)
+            self.subscribe(pygame.TEXTEDITING, self)
+        else:
+            pygame.key.stop_text_input()
+            self.unsubscribe(pygame.TEXTINPUT, self)
+            self.unsubscribe(pygame.TEXTEDITING, self)
+
+    def subscribe(self, event: int, subscriber: Hashable) -> None:
+        """
+        Declares that `subscriber` needs events of type `event`, unblocking them if they were blocked.
+
+        Parameters
+        ----------
+        event : `int`
+            The type of the events, e.g. `pygame.MOUSEMOTION`.
+        subscriber : `Hashable`
+            Whatever needs the events, usually the `System` or `Component` calling this.
+        """
+        self._subscriptions.setdefault(event, set()).add(subscriber)
+
+        if event in self._blocked:
+            self._update_blocked()
+
+    def unsubscribe(self, event: int, subscriber: Hashable) -> None:
+        """
+        Undoes `subscribe`, blocking the events again if nothing else needs them.\n
+        Doesn't raise exception if `subscriber` isn't subscribed.
+        """
+        if (subscribers := self._subscriptions.get(event)) is not None:
+            subscribers.discard(subscriber)
+
+            if not subscribers:
+                del self._subscriptions[event]
+                self._update_blocked()
+
+    def is_blocked(self, event: int) -> bool:
+        return event in self._blocked
 
     def update(self) -> None:
+        self._frame += 1
+
+        if self._on_demand:
+            self._expire_on_demand()
+
         self.events = pygame.event.get()
 
-    def cancel(self, event: Event) -> None:
+        events_by_type: dict[int, list[Event]] = {}
+
+        for evt in self.events:
+            if (same_type := events_by_type.get(evt.type)) is None:
+                events_by_type[evt.type] = [evt]
+            else:
+                same_type.append(evt)
+
+        self._events_by_type = events_by_type
+
+        if self._game.profiler is not None:
+            self._game.profiler.count('events', len(self.events))
+
+    def cancel(self, event: int) -> None:
         """
-        Removes all occurances of `event` from the list of events, effectively cancelling it.
+        Removes all events of type `event` from the list of events, effectively cancelling them.
 
         Parameters
         ----------
-        event : Event
-            _description_
+        event : `int`
+            The type of the events to cancel, e.g. `pygame.KEYDOWN`.
         """
-        filtered = self.filter(event)
+        if self._events_by_type.pop(event, None) is not None:
+            self.events = [evt for evt in self.events if evt.type != event]
+
+    def get(self, event: int) -> Optional[Event]:
+        if event in self._blocked or event in self._on_demand:
+            self._subscribe_on_demand(event)
+
+        if same_type := self._events_by_type.get(event):
+            return same_type[0]
+        return None
+
+    def filter(self, event: int) -> Iterator[Event]:
+        if event in self._blocked or event in self._on_demand:
+            self._subscribe_on_demand(event)
+
+        return iter(self._events_by_type.get(event, ()))
+
+    def list(self, event: int) -> list[Event]:
+        if event in self._blocked or event in self._on_demand:
+            self._subscribe_on_demand(event)
+
+        return list(self._events_by_type.get(event, ()))
+
+    # code that looks up a blocked event type without having subscribed to it would otherwise never
+    # see any of those events, so it gets subscribed automatically. it still misses the events of
+    # the current frame, though, so subscribing beforehand is preferable.
+    # these subscriptions are released once their type hasn't been looked up for `on_demand_frames`
+    # frames, so that the events are blocked again when the code that wanted them stops running.
+    def _subscribe_on_demand(self, event: int) -> None:
+        if event not in self._on_demand:
+            self.subscribe(event, 'on demand')
+
+        self._on_demand[event] = self._frame
+
+    def _expire_on_demand(self) -> None:
+        oldest = self._frame - self.on_demand_frames
+        expired = [event for event, frame in self._on_demand.items() if frame < oldest]
 
-        self.events = [
-            evt
-            for evt in self.events
-            if evt not in filtered
-        ]
+        for event in expired:
+            del self._on_demand[event]
+            self.unsubscribe(event, 'on demand')
 
-    def get(self, event: Event) -> Optional[Event]:
-        return get_by_attrs(self.events, type=event)
+    def _update_blocked(self) -> None:
+        blocked = frozenset(
+            event
+            for event in BLOCKABLE_EVENTS
+            if event not in self._subscriptions
+        ) if self._filtering else frozenset()
 
-    def filter(self, event: Event) -> Iterator[Event]:
-        return filter_by_attrs(self.events, type=event)
+        if unblocked := self._blocked - blocked:
+            pygame.event.set_allowed(list(unblocked))
+        if blocked:
+            pygame.event.set_blocked(list(blocked))
 
-    def list(self, event: Event) -> list[Event]:
-        return list(self.filter(event))
+        self._blocked = blocked
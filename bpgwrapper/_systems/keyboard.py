@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Callable, Type
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Type
 
 import pygame
 from ..core import System
@@ -7,19 +7,35 @@ from ..event import Event
 
 if TYPE_CHECKING:
     from ..game import Game
+    from ..recording import InputPlayer
 
 
 StatefulKeyInputEvent = Callable[[Key, State], None]
 KeyInputEvent = Callable[[Key], None]
 
+# every key gets a dense index, so that key states can be kept as the bits of a single `int`
+# (keycodes themselves can't be used as indices since some of them are larger than 2^30).
+# iterating over `Key` itself skips aliases, unlike `Key.__members__`.
+KEYS = tuple(Key)
+_INDEX_BY_KEY = {key: i for i, key in enumerate(KEYS)}
+_INDEX_BY_KEYCODE = {key.value: i for i, key in enumerate(KEYS)}
+
 
 class Keyboard(System):
+    requires = ('events',)
+    pygame_modules = ('display',)
+    after = ('events',)
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
-        self._keys_down: list[Key] = []
-        self._keys_up: list[Key] = []
-        self._keys_pressed: list[Key] = []
+        # bitsets indexed by `KEYS`
+        self._down = 0
+        self._up = 0
+        self._pressed = 0
+
+        # set by `InputPlayer` while a recording is being replayed
+        self._replay: Optional['InputPlayer'] = None
 
         self.on_key = Event[StatefulKeyInputEvent]()
 
@@ -29,66 +45,149 @@ class Keyboard(System):
 
     @property
     def keys_down(self) -> list[Key]:
-        return self._keys_down
+        return [KEYS[i] for i in _iter_bits(self._down)]
 
     @property
     def keys_up(self) -> list[Key]:
-        return self._keys_up
+        return [KEYS[i] for i in _iter_bits(self._up)]
 
     @property
     def keys_pressed(self) -> list[Key]:
-        return self._keys_pressed
+        return [KEYS[i] for i in _iter_bits(self._pressed)]
+
+    @property
+    def pressed_bits(self) -> int:
+        """
+        The keys that are currently pressed, as a bitset where bit `i` corresponds to `KEYS[i]`.
+        """
+        return self._pressed
+
+    @property
+    def down_bits(self) -> int:
+        """
+        The keys that started being pressed this frame, as a bitset like `pressed_bits`.
+        """
+        return self._down
+
+    @property
+    def up_bits(self) -> int:
+        """
+        The keys that stopped being pressed this frame, as a bitset like `pressed_bits`.
+        """
+        return self._up
+
+    @property
+    def replay(self) -> Optional['InputPlayer']:
+        """
+        The `InputPlayer` whose recording is read instead of live input, if any. Set by the player
+        while it's replaying.
+        """
+        return self._replay
+
+    @replay.setter
+    def replay(self, player: Optional['InputPlayer']) -> None:
+        self._replay = player
 
     def get_key(self, key: Key | str | int, /) -> State:
-        key = self._ensure_input_value_is_enum(key, Key)
+        bit = 1 << self._key_index(key)
         return State.from_bools(
-            pressed=key in self.keys_pressed,
-            up=key in self.keys_up,
-            down=key in self.keys_down
+            pressed=bool(self._pressed & bit),
+            up=bool(self._up & bit),
+            down=bool(self._down & bit)
         )
 
     def get_key_pressed(self, key: Key | str | int, /) -> bool:
-        return bool(self.get_key(key) & State.pressed)
+        return bool(self._pressed >> self._key_index(key) & 1)
 
     def get_key_up(self, key: Key | str | int, /) -> bool:
-        return bool(self.get_key(key) & State.up)
+        return bool(self._up >> self._key_index(key) & 1)
 
     def get_key_down(self, key: Key | str | int, /) -> bool:
-        return bool(self.get_key(key) & State.down)
+        return bool(self._down >> self._key_index(key) & 1)
 
     def any_key(self, state: State=State.none, /) -> bool:
         if state == State.none:
-            return bool(self.keys_down + self.keys_up + self.keys_pressed)
-        return bool(getattr(self, f'keys_{state.name}'))
+            return bool(self._down | self._up | self._pressed)
+        return bool(getattr(self, f'_{state.name}'))
 
     def get_axis(self, negative: Key | str | int, positive: Key | str | int, /) -> float:
-        neg = self.get_key_pressed(negative)
-        pos = self.get_key_pressed(positive)
-
-        if neg and pos:
-            return 0
-        if neg:
-            return -1
-        if pos:
-            return 1
-        return 0
+        neg = self._pressed >> self._key_index(negative) & 1
+        pos = self._pressed >> self._key_index(positive) & 1
+        return pos - neg
 
     def update(self) -> None:
-        self._keys_down = [Key(evt.key) for evt in self._game.events.filter(pygame.KEYDOWN)]
-        self._keys_up = [Key(evt.key) for evt in self._game.events.filter(pygame.KEYUP)]
+        if self._replay is not None:
+            frame = self._replay.frame
+            self._set_state(frame.keys_pressed, frame.keys_down, frame.keys_up)
+            return
+
+        events = self._game.events
+
+        down = 0
+        up = 0
+
+        for evt in events.filter(pygame.KEYDOWN):
+            if (i := _INDEX_BY_KEYCODE.get(evt.key)) is not None:
+                down |= 1 << i
 
+        for evt in events.filter(pygame.KEYUP):
+            if (i := _INDEX_BY_KEYCODE.get(evt.key)) is not None:
+                up |= 1 << i
+
+        self._apply(down, up)
+
+        # key ups that happen while the window isn't focused are never reported, so resync
+        if events.get(pygame.WINDOWFOCUSLOST) or events.get(pygame.WINDOWFOCUSGAINED):
+            self._pressed = self._read_pressed_bits()
+
+    def _apply(self, down: int, up: int) -> None:
+        pressed = (self._pressed | down) & ~up
+
+        # the order of downs and ups of a key that went both down and up during the same frame is
+        # lost when grouping events by type, so its final state is read from pygame instead
+        if both := down & up:
+            all_keys_pressed = pygame.key.get_pressed()
+
+            for i in _iter_bits(both):
+                if all_keys_pressed[KEYS[i].value]:
+                    pressed |= 1 << i
+
+        self._set_state(pressed, down, up)
+
+    def _set_state(self, pressed: int, down: int, up: int) -> None:
+        self._down = down
+        self._up = up
+        self._pressed = pressed
+
+        # only keys whose state changed are reported, except for `on_key_pressed`, which is
+        # meant to be called every frame for every key being held
+        for i in _iter_bits(down):
+            self.on_key.invoke(KEYS[i], State.down)
+            self.on_key_down.invoke(KEYS[i])
+
+        for i in _iter_bits(up):
+            self.on_key.invoke(KEYS[i], State.up)
+            self.on_key_up.invoke(KEYS[i])
+
+        if pressed and len(self.on_key_pressed):
+            for i in _iter_bits(pressed):
+                self.on_key_pressed.invoke(KEYS[i])
+
+    def _read_pressed_bits(self) -> int:
         all_keys_pressed = pygame.key.get_pressed()
 
-        self._keys_pressed = list(filter(
-            lambda key: all_keys_pressed[key.value],
-            Key.__members__.values()
-        ))
+        bits = 0
+
+        for i, key in enumerate(KEYS):
+            if all_keys_pressed[key.value]:
+                bits |= 1 << i
 
-        if self.any_key():
-            for state in [State.down, State.up, State.pressed]:
-                for key in getattr(self, f'keys_{state.name}'):
-                    self.on_key.invoke(key, state)
-                    getattr(self, f'on_key_{state.name}').invoke(key)
+        return bits
+
+    def _key_index(self, key: Key | str | int) -> int:
+        if (i := _INDEX_BY_KEY.get(key)) is not None:  # type: ignore
+            return i
+        return _INDEX_BY_KEY[self._ensure_input_value_is_enum(key, Key)]
 
     # TODO: remove this from here and mouse, and make this a method of a baseclass for Key and MouseButton
     def _ensure_input_value_is_enum(self, value: Key | str | int, type: Type[Key]) -> Key:
@@ -97,3 +196,13 @@ class Keyboard(System):
         if isinstance(value, str):
             return type[value.lower()]
         return value
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    """
+    Yields the indices of the set bits of `bits`, lowest first.
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
@@ -1,21 +1,33 @@
-from typing import TYPE_CHECKING, Callable, Type
+from array import array
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Type
 
 import pygame
 from pygame.math import Vector2
 
+from ..caching import frame_cached
 from ..core import System
 from ..enums import MouseButton, State
 from ..event import Event
 
 if TYPE_CHECKING:
     from ..game import Game
+    from ..recording import InputPlayer
 
 
 StatefulMouseButtonInputEvent = Callable[[MouseButton, State], None]
 MouseButtonInputEvent = Callable[[MouseButton], None]
+MotionMode = Literal['coalesced', 'history']
+MotionSample = tuple[float, float, float]
+
+BUTTONS = tuple(MouseButton)
 
 
 class Mouse(System):
+    requires = ('events', 'camera')
+    pygame_modules = ('display',)
+    after = ('events',)
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
@@ -31,38 +43,205 @@ class Mouse(System):
             MouseButton.right: State.none
         }
 
+        # bitsets where bit `i` is the button whose value is `i`
+        self._buttons_pressed = 0
+        self._buttons_down = 0
+        self._buttons_up = 0
+
+        self._pixel_pos = Vector2()
         self._pixel_vel = Vector2()
+        self._scroll_delta = Vector2()
+        # MOUSEWHEEL events are blocked until `scroll_delta` is used for the first time
+        self._scroll_subscribed = False
 
-    @property
+        self._motion_mode: MotionMode = 'coalesced'
+        self._motion_history_capacity = 1024
+        # ring buffer of (x, y, timestamp) samples, flattened. only allocated in history mode.
+        self._motion = array('d')
+        self._motion_head = 0
+        self._motion_count = 0
+        self._frame_motion_count = 0
+        self._last_motion_time = perf_counter()
+
+        # set by `InputPlayer` while a recording is being replayed
+        self._replay: Optional['InputPlayer'] = None
+
+    @frame_cached(key=lambda self: (self._pixel_pos.x, self._pixel_pos.y), copy=True)
     def pos(self) -> Vector2:
         return self._game.camera.pixel_to_world_pos(self.pixel_pos)
 
     @property
     def pixel_pos(self) -> Vector2:
-        return Vector2(pygame.mouse.get_pos())
+        # the position is kept in the window's pixels, see `Window.render_scale`
+        return self._game.window.window_to_render_pixels(self._pixel_pos)
 
-    @property
+    def live_pos(self) -> Vector2:
+        """
+        Same as `pos`, but sampled right now instead of at the beginning of the frame.\n
+        See `Rendering.late_latch`.
+        """
+        return self._game.camera.pixel_to_world_pos(self.live_pixel_pos())
+
+    def live_pixel_pos(self) -> Vector2:
+        """
+        Same as `pixel_pos`, but sampled right now instead of at the beginning of the frame.
+        """
+        if self._replay is not None:
+            return self.pixel_pos
+
+        # SDL only updates the mouse's position when events are pumped. pumping doesn't remove
+        # any events from the queue, so `Events` still gets them next frame.
+        pygame.event.pump()
+        return self._game.window.window_to_render_pixels(Vector2(pygame.mouse.get_pos()))
+
+    @frame_cached(key=lambda self: (self._pixel_vel.x, self._pixel_vel.y), copy=True)
     def vel(self) -> Vector2:
         return self._game.camera.pixel_to_world_pos(self.pixel_vel)
 
     @property
     def pixel_vel(self) -> Vector2:
-        return self._pixel_vel
+        return self._game.window.window_to_render_pixels(self._pixel_vel)
 
     @property
     def scroll_delta(self) -> Vector2:
-        # is it even possible to have multiple of these in one frame?
-        if evts := self._game.events.list(pygame.MOUSEWHEEL):
-            return Vector2(
-                sum(evt.x for evt in evts),
-                sum(evt.y for evt in evts)
-            )
-        return Vector2()
+        if not self._scroll_subscribed:
+            self._game.events.subscribe(pygame.MOUSEWHEEL, self)
+            self._scroll_subscribed = True
+
+        # a copy, like `pos` and `vel`, so that callers can't change what the next reads return
+        return Vector2(self._scroll_delta)
+
+    @property
+    def motion_mode(self) -> MotionMode:
+        """
+        `coalesced` (the default) only keeps the final position and the summed motion of each frame,
+        and keeps MOUSEMOTION events blocked altogether.\n
+        `history` additionally folds every MOUSEMOTION event into a ring buffer of
+        `motion_history_capacity` (x, y, timestamp) samples, e.g. for capturing strokes in
+        drawing tools. See `motion_samples`.
+        """
+        return self._motion_mode
+
+    @motion_mode.setter
+    def motion_mode(self, mode: MotionMode) -> None:
+        self._motion_mode = mode
+        self._reset_motion()
+
+        if mode == 'history':
+            self._game.events.subscribe(pygame.MOUSEMOTION, self)
+        else:
+            self._game.events.unsubscribe(pygame.MOUSEMOTION, self)
+
+    @property
+    def motion_history_capacity(self) -> int:
+        """
+        How many samples the ring buffer of `history` motion mode holds. 1024 by default.\n
+        Changing it while in `history` mode clears the samples recorded so far.
+        """
+        return self._motion_history_capacity
+
+    @motion_history_capacity.setter
+    def motion_history_capacity(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f'The motion history capacity must be at least 1, not {capacity}!')
+
+        self._motion_history_capacity = capacity
+        self._reset_motion()
+
+    @property
+    def motion_buffer(self) -> 'array[float]':
+        """
+        The raw ring buffer used in `history` motion mode, as flattened (x, y, timestamp) triples.\n
+        It supports the buffer protocol, so it can be wrapped without copying, e.g. with
+        `numpy.frombuffer(mouse.motion_buffer).reshape(-1, 3)`.
+        """
+        return self._motion
+
+    def motion_samples(self, count: Optional[int] = None) -> list[MotionSample]:
+        """
+        Returns the latest (x, y, timestamp) motion samples, oldest first, in the window's pixels.\n
+        Only available in `history` motion mode, and empty otherwise.
+
+        Parameters
+        ----------
+        count : `Optional[int], optional`
+            How many samples to return. By default, the samples from the current frame.
+            Can't be more than `motion_history_capacity`.
+
+        Returns
+        -------
+        `list[MotionSample]`
+            The samples. Their timestamps are in `time.perf_counter` seconds, and since pygame
+            doesn't expose SDL's event timestamps, they are spread evenly over the frame.
+        """
+        if self._motion_mode != 'history':
+            return []
+
+        capacity = len(self._motion) // 3
+        count = min(self._frame_motion_count if count is None else count, self._motion_count)
+
+        buffer = self._motion
+        samples = []
+
+        for i in range(self._motion_head - count, self._motion_head):
+            j = i % capacity * 3
+            samples.append((buffer[j], buffer[j + 1], buffer[j + 2]))
+
+        return samples
 
     @property
     def buttons_states(self) -> dict[MouseButton, State]:
         return self._buttons_states
 
+    @property
+    def pressed_bits(self) -> int:
+        """
+        The buttons that are currently pressed, as a bitset where bit `i` corresponds to the
+        `MouseButton` whose value is `i`.
+        """
+        return self._buttons_pressed
+
+    @property
+    def down_bits(self) -> int:
+        """
+        The buttons that started being pressed this frame, as a bitset like `pressed_bits`.
+        """
+        return self._buttons_down
+
+    @property
+    def up_bits(self) -> int:
+        """
+        The buttons that stopped being pressed this frame, as a bitset like `pressed_bits`.
+        """
+        return self._buttons_up
+
+    @property
+    def window_pixel_pos(self) -> Vector2:
+        """
+        The position in the window's pixels, which unlike `pixel_pos` doesn't depend on
+        `Window.render_scale`.
+        """
+        return Vector2(self._pixel_pos)
+
+    @property
+    def window_pixel_vel(self) -> Vector2:
+        """
+        The movement this frame in the window's pixels, see `window_pixel_pos`.
+        """
+        return Vector2(self._pixel_vel)
+
+    @property
+    def replay(self) -> Optional['InputPlayer']:
+        """
+        The `InputPlayer` whose recording is read instead of live input, if any. Set by the player
+        while it's replaying.
+        """
+        return self._replay
+
+    @replay.setter
+    def replay(self, player: Optional['InputPlayer']) -> None:
+        self._replay = player
+
     @property
     def visible(self) -> bool:
         return pygame.mouse.get_visible()
@@ -70,7 +249,7 @@ class Mouse(System):
     @visible.setter
     def visible(self, value: bool) -> None:
         pygame.mouse.set_visible(value)
-    
+
     def get_button(self, mouse_button: MouseButton | str | int, /) -> State:
         mouse_button = self._ensure_input_value_is_enum(mouse_button, MouseButton)
         return self._buttons_states[mouse_button]
@@ -80,7 +259,7 @@ class Mouse(System):
 
     def get_button_down(self, mouse_button: MouseButton | str | int, /) -> bool:
         return bool(self.get_button(mouse_button) & State.down)
-    
+
     def get_button_up(self, mouse_button: MouseButton | str | int, /) -> bool:
         return bool(self.get_button(mouse_button) & State.up)
 
@@ -90,13 +269,61 @@ class Mouse(System):
         return any(btn_state & state for btn_state in self._buttons_states.values())
 
     def update(self) -> None:
+        if self._replay is not None:
+            frame = self._replay.frame
+
+            self._pixel_pos = Vector2(frame.pixel_pos)
+            self._pixel_vel = Vector2(frame.pixel_rel)
+            self._scroll_delta = Vector2(frame.scroll)
+            self._set_buttons(frame.buttons_pressed, frame.buttons_down, frame.buttons_up)
+            return
+
+        events = self._game.events
+
         all_buttons_pressed = pygame.mouse.get_pressed()
+        pressed = sum(1 << btn.value for btn in BUTTONS if all_buttons_pressed[btn.value])
+
+        self._set_buttons(
+            pressed,
+            self._read_buttons(pygame.MOUSEBUTTONDOWN),
+            self._read_buttons(pygame.MOUSEBUTTONUP)
+        )
 
-        for btn in MouseButton.__members__.values():
+        self._pixel_pos = Vector2(pygame.mouse.get_pos())
+        self._pixel_vel = Vector2(pygame.mouse.get_rel())
+
+        if self._motion_mode == 'history':
+            self._record_motion()
+
+        # is it even possible to have multiple of these in one frame?
+        if self._scroll_subscribed and (evts := events.list(pygame.MOUSEWHEEL)):
+            self._scroll_delta = Vector2(
+                sum(evt.x for evt in evts),
+                sum(evt.y for evt in evts)
+            )
+        else:
+            self._scroll_delta = Vector2()
+
+    def _reset_motion(self) -> None:
+        self._motion_head = 0
+        self._motion_count = 0
+        self._frame_motion_count = 0
+
+        if self._motion_mode == 'history':
+            self._motion = array('d', bytes(8 * 3 * self._motion_history_capacity))
+        else:
+            self._motion = array('d')
+
+    def _set_buttons(self, pressed: int, down: int, up: int) -> None:
+        self._buttons_pressed = pressed
+        self._buttons_down = down
+        self._buttons_up = up
+
+        for btn in BUTTONS:
             self._buttons_states[btn] = State.from_bools(
-                pressed=all_buttons_pressed[btn.value],
-                up=self._is_btn_down_or_up(btn, pygame.MOUSEBUTTONUP),
-                down=self._is_btn_down_or_up(btn, pygame.MOUSEBUTTONDOWN)
+                pressed=bool(pressed >> btn.value & 1),
+                up=bool(up >> btn.value & 1),
+                down=bool(down >> btn.value & 1)
             )
 
         if self.any_button():
@@ -112,7 +339,27 @@ class Mouse(System):
                     else:
                         getattr(self, f'on_button_{state.name}').invoke(btn)
 
-        self._pixel_vel = Vector2(pygame.mouse.get_rel())
+    def _record_motion(self) -> None:
+        motion = self._game.events.list(pygame.MOUSEMOTION)
+        buffer = self._motion
+        capacity = len(buffer) // 3
+
+        now = perf_counter()
+        step = (now - self._last_motion_time) / len(motion) if motion else 0
+        time = self._last_motion_time
+        head = self._motion_head
+
+        for evt in motion:
+            time += step
+            i = head * 3
+            buffer[i], buffer[i + 1] = evt.pos
+            buffer[i + 2] = time
+            head = (head + 1) % capacity
+
+        self._motion_head = head
+        self._motion_count = min(self._motion_count + len(motion), capacity)
+        self._frame_motion_count = len(motion)
+        self._last_motion_time = now
 
     def _ensure_input_value_is_enum(self, value: MouseButton | str | int, type: Type[MouseButton]) -> MouseButton:
         if isinstance(value, int):
@@ -121,13 +368,16 @@ class Mouse(System):
             return type[value.lower()]
         return value
 
-    # idfk what to name this func
-    # probably better to define this method outside of update's scope
-    # for perfomance reasons (idk probably this wouldn't be the main
-    # issue if there are any perf problems with the input system -
-    # which is very probable considering we do a lotta stuff here
-    # to make it as flexible as possible)
-    def _is_btn_down_or_up(self, btn: MouseButton, type: pygame.event.Event) -> bool:
-        if evt := self._game.events.get(type):
-            return evt.button - 1 == btn.value  # type: ignore
-        return False
+    def _read_buttons(self, type: int) -> int:
+        """
+        Returns a bitset of the buttons that have events of `type` (`MOUSEBUTTONDOWN` or
+        `MOUSEBUTTONUP`) this frame.
+        """
+        bits = 0
+
+        for evt in self._game.events.filter(type):
+            # pygame's buttons start at 1, and 4+ are extra buttons we don't handle
+            if 1 <= evt.button <= len(BUTTONS):
+                bits |= 1 << (evt.button - 1)
+
+        return bits
@@ -1,29 +1,96 @@
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Callable
 
 from ..core import System
 from ..event import Event, NoArgEvent
 from ..renderables import Renderable
-from ..utils import filter_by_attrs
 
 if TYPE_CHECKING:
     from ..game import Game
 
 
 class Rendering(System):
+    requires = ('camera', 'window')
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
         self.renderables: list[Renderable] = []
+        # (renderable, attribute, source)
+        self._late_latches: list[tuple[Renderable, str, Callable[[], Any]]] = []
+        # released renderables by type, see `Renderable.acquire`
+        self._pools: defaultdict[type[Renderable], list[Renderable]] = defaultdict(list)
+
+        # level of detail: shapes smaller than `lod_pixel_size` pixels across are drawn as a single
+        # pixel (or a plain fill), and circles smaller than `lod_aa_size` aren't antialiased, since
+        # it wouldn't be noticeable anyway. set either to 0 to turn it off.
+        self.lod_pixel_size = 2
+        self.lod_aa_size = 6
+        # quality switches for every shape, see `governors.QualityGovernor`. strokes of shapes
+        # without a fill are still drawn, since they're the whole shape.
+        self.antialiasing = True
+        self.strokes = True
 
         self.before_render = Event[NoArgEvent]()
         self.on_render = Event[NoArgEvent]()
 
+    def late_latch(self, renderable: Renderable, source: Callable[[], Any], attr: str = 'pos') -> None:
+        """
+        Binds an attribute of a renderable to a live source, which is sampled right before drawing
+        instead of whenever game code would've set it during the frame.\n
+        This gives visuals attached to input (such as a custom cursor) the lowest possible latency.
+
+        >>> game.rendering.late_latch(cursor, game.mouse.live_pos)
+
+        Parameters
+        ----------
+        renderable : `Renderable`
+            The renderable whose attribute will be set.
+        source : `Callable[[], Any]`
+            Returns the attribute's up to date value, e.g. `Mouse.live_pos`.
+        attr : `str, optional`
+            The attribute that will be set, `pos` by default.
+        """
+        self.release_late_latch(renderable, attr)
+        self._late_latches.append((renderable, attr, source))
+
+    def release_late_latch(self, renderable: Renderable, attr: str = 'pos') -> None:
+        """
+        Undoes `late_latch`. Doesn't raise exception if the attribute isn't latched.
+        """
+        self._late_latches = [
+            latch
+            for latch in self._late_latches
+            if not (latch[0] is renderable and latch[1] == attr)
+        ]
+
     def post_update(self) -> None:
         self.before_render.invoke()
 
+        for renderable, attr, source in self._late_latches:
+            setattr(renderable, attr, source())
+
         for renderable in self.renderables:
             renderable.draw()
+
+        if self._game.profiler is not None:
+            self._game.profiler.count('draws', len(self.renderables))
         
         self.on_render.invoke()
 
-        self.renderables = list(filter_by_attrs(self.renderables, always_render=True))
+        kept = []
+        pools = self._pools
+
+        # this runs for every renderable every frame, so `_release` is inlined here
+        for renderable in self.renderables:
+            if renderable._always_render:
+                kept.append(renderable)
+            elif renderable._pooled:
+                renderable._pooled = False
+                pools[type(renderable)].append(renderable)
+
+        self.renderables = kept
+
+    def _release(self, renderable: Renderable) -> None:
+        renderable._pooled = False
+        self._pools[type(renderable)].append(renderable)
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 
 class Scheduling(System):
+    requires = ('time',)
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
@@ -28,6 +30,14 @@ class Scheduling(System):
                 except StopIteration:
                     self.stop_coroutine(coroutine)
 
+    def _shift_frames(self, frames: int) -> None:
+        """
+        Moves the frame coroutines are waiting for by `frames`, for when the frame count jumps.
+        """
+        for yieldable in self._coroutines.values():
+            if isinstance(yieldable, WaitForFrames):
+                yieldable._ready_frame += frames
+
     def _get_next(self, func: Coroutine) -> Yieldable:
         n = next(func)
         return n if n is not None else WaitForFrames(self._game, 1)
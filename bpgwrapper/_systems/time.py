@@ -1,30 +1,64 @@
+from collections import deque
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Optional
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING, Literal, Optional
 
 import pygame
 
 from ..core import System
+from ..utils import percentile, summarize
 
 if TYPE_CHECKING:
     from ..game import Game
 
 
+Limiter = Literal['sleep', 'busy', 'hybrid']
+
+
 class Time(System):
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
+        # frames are paced with `perf_counter` below, but this is still ticked (without a limit)
+        # every frame so that code using `clock.get_fps()` and such keeps working
         self.clock = pygame.time.Clock()
 
-        self._deltatime = 0
+        self._deltatime = 0.0
         self._frame_count = 0
-        self._startup_time: Optional[datetime] = None
-
-        self.target_framerate = 60
+        # `perf_counter` at startup, which unlike `datetime.now` is monotonic and high resolution.
+        # both `startup_time` and `time_since_startup` are derived from it.
+        self._startup_counter: Optional[float] = None
+
+        self.target_framerate: Optional[float] = 60
+        # when set, `deltatime` is always this instead of the measured frame time, which makes
+        # simulations deterministic regardless of how fast they run
+        self.fixed_deltatime: Optional[float] = None
+
+        # how frames wait for `target_framerate`:
+        #   sleep: sleeps until the deadline. cheapest, but OS sleeps can overshoot by milliseconds.
+        #   busy: spins until the deadline. precise, but keeps a core busy.
+        #   hybrid: sleeps until `spin_threshold` seconds before the deadline, then spins.
+        self.limiter: Limiter = 'hybrid'
+        # the higher, the more precise the hybrid limiter is, and the more CPU it uses
+        self.spin_threshold = 0.002
+
+        # raw frame times (without the time spent waiting for `target_framerate`) and intervals
+        # between frames, in seconds
+        self._frame_times: deque[float] = deque(maxlen=120)
+        self._intervals: deque[float] = deque(maxlen=120)
+        self._dropped_frames = 0
+
+        now = perf_counter()
+        # when the last frame ended and when it was supposed to, after waiting
+        self._frame_end = now
+        self._deadline = now
 
         self._game.on_start += self._on_start
 
     @property
     def deltatime(self) -> float:
+        if self.fixed_deltatime is not None:
+            return self.fixed_deltatime
         return self._deltatime
 
     @property
@@ -33,25 +67,150 @@ class Time(System):
 
     @property
     def framerate(self) -> float:
-        return self.clock.get_fps()
+        """
+        The average framerate over the last 10 frames.
+        """
+        intervals = list(self._intervals)[-10:]
+        total = sum(intervals)
+
+        return len(intervals) / total if total > 0 else 0
+
+    @property
+    def raw_frame_time(self) -> float:
+        """
+        How long the last frame took in seconds, not counting the time spent waiting to keep
+        `target_framerate`, i.e. how long frames could take without a limit.
+        """
+        return self._frame_times[-1] if self._frame_times else 0
+
+    @property
+    def frame_time_history(self) -> int:
+        """
+        How many frames are kept for `frame_time_percentile` and `frame_time_stats`. 120 by
+        default.
+        """
+        return self._frame_times.maxlen or 0
+
+    @frame_time_history.setter
+    def frame_time_history(self, frames: int) -> None:
+        self._frame_times = deque(self._frame_times, maxlen=frames)
+        self._intervals = deque(self._intervals, maxlen=frames)
+
+    @property
+    def dropped_frames(self) -> int:
+        """
+        How many frames were missed since startup, i.e. how many times `target_framerate`'s
+        deadline passed without a frame being finished. Frames without a target framerate don't
+        count.
+        """
+        return self._dropped_frames
+
+    def frame_time_percentile(self, q: float, frames: Optional[int] = None) -> float:
+        """
+        Returns the `q`th percentile (0-100) of the raw frame times (see `raw_frame_time`), in
+        seconds.
+
+        Parameters
+        ----------
+        q : `float`
+            The percentile, e.g. `95`.
+        frames : `Optional[int], optional`
+            Only take the last `frames` frames into account. All of `frame_time_history` by default.
+
+        Returns
+        -------
+        `float`
+            The percentile, or `0` if no frames were measured yet.
+        """
+        samples = list(self._frame_times)
+        return percentile(samples if frames is None else samples[-frames:], q)
+
+    def frame_time_stats(self, raw: bool = False) -> dict[str, float]:
+        """
+        Returns the mean, p50, p95, p99 and max of the time between frames (or of the raw frame
+        times, see `raw_frame_time`) over the last `frame_time_history` frames, in milliseconds.
+        """
+        return summarize(self._frame_times if raw else self._intervals, scale=1000)
+
+    def frame_time_histogram(self, bin_size: float = 1, raw: bool = False) -> dict[float, int]:
+        """
+        Returns how many of the last `frame_time_history` frames took how long, as a dict of the
+        start of each bin (in milliseconds) to how many frames fell in it. Empty bins are left out.
+
+        Parameters
+        ----------
+        bin_size : `float, optional`
+            The width of the bins, in milliseconds.
+        raw : `bool, optional`
+            Whether to use the raw frame times instead of the time between frames.
+        """
+        histogram: dict[float, int] = {}
+
+        for sample in self._frame_times if raw else self._intervals:
+            start = sample * 1000 // bin_size * bin_size
+            histogram[start] = histogram.get(start, 0) + 1
+
+        return dict(sorted(histogram.items()))
 
     # docs: returns none if the game hasn't started
     @property
     def startup_time(self) -> Optional[datetime]:
-        return self._startup_time
+        if (since := self.time_since_startup) is None:
+            return None
+
+        return datetime.now() - since
 
     # docs: returns none if the game hasn't started
     @property
     def time_since_startup(self) -> Optional[timedelta]:
-        if self.startup_time is None:
+        if self._startup_counter is None:
             return None
 
-        return datetime.now() - self.startup_time
+        return timedelta(seconds=perf_counter() - self._startup_counter)
 
     def _on_start(self) -> None:
-        self._startup_time = datetime.now()
+        self._startup_counter = perf_counter()
+
+        # the time spent setting up shouldn't count as the first frame
+        self._frame_end = self._deadline = self._startup_counter
 
     def post_update(self) -> None:
         self._frame_count += 1
-        # why is mypy so dumb why cant it see the / 1000 right there what the fu
-        self._deltatime = self.clock.tick(0 if self.target_framerate is None else self.target_framerate) / 1000  # type: ignore
+
+        now = perf_counter()
+        self._frame_times.append(now - self._frame_end)
+
+        if self.target_framerate:
+            period = 1 / self.target_framerate
+            deadline = self._deadline + period
+
+            if now > deadline:
+                # late: the deadlines that passed are dropped frames, and the next ones are
+                # counted from now instead of trying to catch up
+                self._dropped_frames += int((now - deadline) / period) + 1
+                deadline = now
+            else:
+                self._wait(deadline)
+                now = perf_counter()
+
+            self._deadline = deadline
+        else:
+            self._deadline = now
+
+        self._deltatime = now - self._frame_end
+        self._intervals.append(self._deltatime)
+        self._frame_end = now
+
+        self.clock.tick()
+
+    def _wait(self, deadline: float) -> None:
+        if self.limiter != 'busy':
+            margin = self.spin_threshold if self.limiter == 'hybrid' else 0
+            remaining = deadline - perf_counter() - margin
+
+            if remaining > 0:
+                sleep(remaining)
+
+        if self.limiter != 'sleep':
+            while perf_counter() < deadline:
+                pass
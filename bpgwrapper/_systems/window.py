@@ -1,25 +1,39 @@
-from ctypes import byref, windll
-from ctypes.wintypes import RECT as cRect
+import sys
 from glob import glob
 from pathlib import Path
 from random import uniform
 from typing import TYPE_CHECKING, Literal, Optional
 
 import pygame
+from pygame._sdl2.video import Window as SDLWindow
 from pygame.color import Color
 from pygame.math import Vector2
 from pygame.surface import Surface
 
 from ..backgrounds import Background, ColorBackground
+from ..caching import frame_cached
 from ..core import System
 from ..utils import vec2_to_int_tuple
 from ..event import Event, NoArgEvent
 
 if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from ..framebuffer import FrameBuffer
     from ..game import Game
 
+if sys.platform == 'win32':
+    from ctypes import byref, windll
+    from ctypes.wintypes import RECT as cRect
+
 
 class Window(System):
+    requires = ('events', 'camera')
+    pygame_modules = ('display',)
+    # the display is updated after everything has been drawn
+    after = ('events', 'rendering')
+
     def __init__(self, game: 'Game') -> None:
         super().__init__(game)
 
@@ -36,8 +50,20 @@ class Window(System):
         self._resizable = True
         self._fullscreen = False
 
-        self.surface = self._setup_window()
-        self._hwnd = pygame.display.get_wm_info()['window']
+        self.display_surface = self._setup_window()
+        # the surface everything is drawn on. the display surface, unless there's a `frame_buffer`
+        # or a `render_scale`.
+        self.surface = self.display_surface
+        self._frame_buffer: Optional['FrameBuffer'] = None
+
+        self._render_scale = 1.0
+        self._render_size = self._size
+        # what `surface` is upscaled to when there's a render scale
+        self._render_surface: Optional[Surface] = None
+        # whether `surface` is upscaled with `pygame.transform.smoothscale` instead of `scale`
+        self.smooth_upscale = False
+        # not every video driver has a native window handle (e.g. SDL's dummy driver)
+        self._hwnd = pygame.display.get_wm_info().get('window')
 
         self.background: Optional[Background] = ColorBackground(self.surface, Color('#FFEECF'))
 
@@ -62,6 +88,9 @@ class Window(System):
 
     @property
     def pos(self) -> Vector2:
+        if sys.platform != 'win32':
+            return Vector2(SDLWindow.from_display_module().position)
+
         rect = cRect()
         windll.user32.GetWindowRect(self._hwnd, byref(rect))
         # wintypes.Rect's members are longs, not ints, so mypy complains
@@ -69,6 +98,10 @@ class Window(System):
 
     @pos.setter
     def pos(self, pos: Vector2) -> None:  # TODO:
+        if sys.platform != 'win32':
+            SDLWindow.from_display_module().position = vec2_to_int_tuple(pos)
+            return
+
         # for some reason setting the size of the window to an exact number will result in the window's
         # actual size being set to that number minus 16 on the x axis and 39 on the y axis.
         # no clue if this only happens in my machine but i'll offset self.size by that amount to
@@ -86,7 +119,8 @@ class Window(System):
     @size.setter
     def size(self, size: Vector2) -> None:
         self._size = size
-        self.surface = self._set_mode_with_resizable(size)
+        self.display_surface = self._set_mode_with_resizable(size)
+        self._retarget()
         # apparently a WINDOWRESIZED event is not fired when `set_mode` is called so we have
         # to do this manually
         self.on_resize.invoke()
@@ -108,17 +142,83 @@ class Window(System):
     @resizable.setter
     def resizable(self, value: bool) -> None:
         self._resizable = value
-        self.surface = self._set_mode_with_resizable(self.size)
+        self.display_surface = self._set_mode_with_resizable(self.size)
+        self._retarget()
+
+    @property
+    def frame_buffer(self) -> Optional['FrameBuffer']:
+        """
+        Where frames are rendered to instead of straight to the display surface, so that they can
+        be read as NumPy arrays without copying them (see `frame`). Each finished frame is then
+        copied to the display surface. `None` by default.
+        """
+        return self._frame_buffer
+
+    @frame_buffer.setter
+    def frame_buffer(self, frame_buffer: Optional['FrameBuffer']) -> None:
+        self._frame_buffer = frame_buffer
+        self._retarget()
+
+    @property
+    def render_scale(self) -> float:
+        """
+        The resolution everything is drawn at, relative to the window's `size`. Below `1`, frames
+        are drawn on a smaller `surface` which is then upscaled, which is cheaper for fill-bound
+        games (see `governors.DynamicResolution`). `1` by default.
+
+        Pixel positions (e.g. `Camera.world_to_pixel_pos` and `Mouse.pixel_pos`) are in the
+        pixels of `surface`, i.e. of `render_size`.
+        """
+        return self._render_scale
+
+    @render_scale.setter
+    def render_scale(self, scale: float) -> None:
+        if scale <= 0:
+            raise ValueError(f'The render scale must be positive, not {scale}!')
+
+        self._render_scale = scale
+        self._retarget()
+
+    @property
+    def render_size(self) -> Vector2:
+        """
+        The size of `surface`, i.e. `size` times `render_scale`.
+        """
+        return self._render_size
+
+    def window_to_render_pixels(self, pos: Vector2) -> Vector2:
+        """
+        Converts a position in the window's pixels, e.g. from a pygame event, to the pixels of
+        `surface`, which differ when there's a `render_scale`.
+        """
+        if self._render_scale == 1:
+            return pos
+
+        return Vector2(pos.x * self._render_size.x / self._size.x, pos.y * self._render_size.y / self._size.y)
 
     @property
+    def frame(self) -> 'NDArray[np.uint8]':
+        """
+        The last frame, as a `(height, width, 3)` RGB NumPy array that shares memory with it, so
+        there's no need to copy the whole frame with e.g. `pygame.surfarray.array3d`.\n
+        Without a `frame_buffer`, this is a view of the display surface, which stays locked (and
+        can't be blitted to) until the array is deleted.
+        """
+        if self._frame_buffer is not None:
+            return self._frame_buffer.frame
+
+        from pygame.surfarray import pixels3d
+        return pixels3d(self.display_surface).transpose(1, 0, 2)
+
+    @frame_cached(copy=True)
     def center(self) -> Vector2:
         return self._game.camera.pixel_to_world_pos(self.center_pixel_pos)
 
     @property
     def center_pixel_pos(self) -> Vector2:
-        return self.size // 2
+        return self._render_size // 2
 
-    @property
+    @frame_cached(copy=True)
     def top_left(self) -> Vector2:
         return self._game.camera.pixel_to_world_pos(self.top_left_pixel_pos)
 
@@ -126,13 +226,13 @@ class Window(System):
     def top_left_pixel_pos(self) -> Vector2:
         return Vector2()
 
-    @property
+    @frame_cached(copy=True)
     def bottom_right(self) -> Vector2:
         return self._game.camera.pixel_to_world_pos(self.bottom_right_pixel_pos)
 
     @property
     def bottom_right_pixel_pos(self) -> Vector2:
-        return self.size
+        return self._render_size
 
     def update(self) -> None:
         if self.background is not None:
@@ -141,8 +241,20 @@ class Window(System):
         if self._game.events.get(pygame.WINDOWRESIZED):
             self.on_resize.invoke()
             self._size = Vector2(pygame.display.get_window_size())
+            self._retarget()
 
     def post_update(self) -> None:
+        if self._render_surface is not None:
+            output = self._output()
+            upscale = pygame.transform.smoothscale if self.smooth_upscale else pygame.transform.scale
+            upscale(self.surface, output.get_size(), output)
+
+        if self._frame_buffer is not None:
+            self.display_surface.blit(self._frame_buffer.surface, (0, 0))
+            self._frame_buffer.present()
+            # double-buffered frame buffers draw the next frame on another surface
+            self._retarget()
+
         pygame.display.update()
 
     def toggle_fullscreen(self) -> None:
@@ -174,7 +286,7 @@ class Window(System):
 
                     path = f'{pathstr}{count_separator}{count + 1}{ext}'
 
-        pygame.image.save(self.surface, path)
+        pygame.image.save(self.display_surface, path)
 
     def random_position(self, unit: Literal['world', 'pixel']='world') -> Vector2:
         if unit == 'world':
@@ -188,6 +300,35 @@ class Window(System):
                 uniform(self.top_left_pixel_pos.y, self.bottom_right_pixel_pos.y)
             )
 
+    def _retarget(self) -> None:
+        # the size of `surface` is what pixel conversions depend on
+        self._game.invalidate_frame_cache()
+
+        if self._render_scale == 1:
+            self._render_size = self._size
+            self._render_surface = None
+            self.surface = self._output()
+        else:
+            self._render_size = Vector2(
+                max(1, round(self._size.x * self._render_scale)),
+                max(1, round(self._size.y * self._render_scale))
+            )
+
+            if self._render_surface is None or self._render_surface.get_size() != self._render_size:
+                # same format as the display, so that upscaling doesn't have to convert anything
+                self._render_surface = Surface(self._render_size, 0, self._output())
+
+            self.surface = self._render_surface
+
+        if self.background is not None:
+            self.background.surface = self.surface
+
+    def _output(self) -> Surface:
+        """
+        The surface finished frames end up on: the display surface, or the frame buffer's.
+        """
+        return self.display_surface if self._frame_buffer is None else self._frame_buffer.surface
+
     def _set_mode_with_resizable(self, size: Vector2) -> Surface:
         if self.resizable:
             return pygame.display.set_mode(size, pygame.RESIZABLE)
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Generic, Optional, TypeVar, overload
+
+V = TypeVar('V')
+FrameCachedSelf = TypeVar('FrameCachedSelf', bound='FrameCached[Any]')
+
+
+class FrameCached(Generic[V]):
+    """
+    A read-only property whose value is computed at most once per frame, see `frame_cached`.
+    """
+
+    def __init__(self, func: Callable[[Any], V], key: Optional[Callable[[Any], Any]] = None, copy: bool = False) -> None:
+        self.func = func
+        self.key = key
+        self.copy = copy
+        self.__doc__ = func.__doc__
+        # where the instance keeps (epoch, key, value)
+        self.attr = f'_{func.__name__}_cache'
+
+    @overload
+    def __get__(self: FrameCachedSelf, instance: None, owner: Optional[type] = None) -> FrameCachedSelf:
+        ...
+
+    @overload
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> V:
+        ...
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+
+        epoch = instance._game._cache_epoch
+        key = None if self.key is None else self.key(instance)
+        cached = getattr(instance, self.attr, None)
+
+        if cached is not None and cached[0] == epoch and cached[1] == key:
+            value = cached[2]
+        else:
+            value = self.func(instance)
+            setattr(instance, self.attr, (epoch, key, value))
+
+        # mutable values (e.g. vectors) are copied, so that changing them doesn't change the cache
+        return value.copy() if self.copy else value
+
+
+@overload
+def frame_cached(func: Callable[[Any], V], /) -> FrameCached[V]:
+    ...
+
+
+@overload
+def frame_cached(*, key: Optional[Callable[[Any], Any]] = None, copy: bool = False) -> Callable[[Callable[[Any], V]], FrameCached[V]]:
+    ...
+
+
+def frame_cached(func: Any = None, /, *, key: Optional[Callable[[Any], Any]] = None, copy: bool = False) -> Any:
+    """
+    Like `property`, but the value is only computed again once the game's cache epoch changes:
+    every frame, and whenever something most derived properties depend on changes, such as
+    `Camera.pos` being set or the window being resized (see `Game.invalidate_frame_cache`).\n
+    Instances must have a `_game`, and if they're slotted, a `_<name>_cache` slot.
+
+    >>> @frame_cached(key=lambda self: (self.pos.x, self.pos.y))
+    ... def pixel_pos(self) -> Tuple[int, int]:
+    ...     return self._game.camera.world_to_pixel_xy(self.pos.x, self.pos.y)
+
+    Parameters
+    ----------
+    key : `Optional[Callable[[Any], Any]], optional`
+        Returns the instance's own inputs to the property, such as a renderable's `pos`, which
+        are compared to those of the cached value, so that it's also computed again when they
+        change during the frame. Mutable inputs must be copied (e.g. into a tuple).
+    copy : `bool, optional`
+        Whether to return copies of the cached value, for mutable values such as `Vector2`.
+    """
+    if func is None:
+        return lambda func: FrameCached(func, key, copy)
+
+    return FrameCached(func, key, copy)
@@ -1,14 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
     from .game import Game
 
 
 class System:
+    """
+    Something that runs every frame, in two phases: `update`, before components are updated, and
+    `post_update`, after them.\n
+    Systems only take part in the phases whose method they override, and are ordered according
+    to `after` and `before` (and otherwise in the order they were created in), see `Game.systems`.
+    """
+
+    # what other systems refer to this one as in `requires`, `after` and `before`. the class' name
+    # in lowercase by default, which for built-in systems is also their attribute in `Game`.
+    name: ClassVar[str] = 'system'
+    # built-in systems this one uses, which `Game` creates along with it
+    requires: ClassVar[tuple[str, ...]] = ()
+    # pygame modules this system needs initialized, e.g. `display`
+    pygame_modules: ClassVar[tuple[str, ...]] = ()
+    # systems this one must run after and before in every phase. missing ones are ignored.
+    after: ClassVar[tuple[str, ...]] = ()
+    before: ClassVar[tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if 'name' not in cls.__dict__:
+            cls.name = cls.__name__.lower()
+
     def __init__(self, game: 'Game') -> None:
         self._game = game
-        self._game.systems.append(self)
+        self._game.add_system(self)
 
     def update(self) -> None:
         pass
@@ -16,6 +40,11 @@ class System:
     def post_update(self) -> None:
         pass
 
+    def removed(self) -> None:
+        """
+        Called after the system is removed with `Game.remove_system`, e.g. to release resources.
+        """
+
 
 class Component(ABC):
     def __init__(self, game: 'Game') -> None:
@@ -0,0 +1,484 @@
+from dataclasses import dataclass
+from functools import partial
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, Optional
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+from pygame import gfxdraw
+from pygame.color import Color
+from pygame.math import Vector2
+
+from .core import System
+from .renderables import Renderable
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+Phase = Literal['update', 'before_update', 'on_update']
+BulkSystem = Callable[..., None]
+
+
+@dataclass(frozen=True)
+class ComponentType:
+    name: str
+    dtype: np.dtype[Any]
+    shape: tuple[int, ...] = ()
+
+
+class Archetype:
+    """
+    Storage for all entities that have exactly the same set of components.\n
+    Each component is a preallocated NumPy array whose first axis is the entity's row. Rows are
+    kept dense (removal swaps the last row into the hole), so `view` never has gaps.
+    """
+
+    def __init__(self, types: tuple[ComponentType, ...], capacity: int = 64) -> None:
+        self.types = types
+        self.signature = frozenset(t.name for t in types)
+        self.size = 0
+
+        self._entities = np.empty(capacity, dtype=np.int64)
+        self._columns = {t.name: np.zeros((capacity, *t.shape), dtype=t.dtype) for t in types}
+
+    @property
+    def capacity(self) -> int:
+        return len(self._entities)
+
+    @property
+    def entities(self) -> NDArray[np.int64]:
+        return self._entities[:self.size]
+
+    def view(self, name: str) -> NDArray[Any]:
+        """
+        Returns a view (not a copy) of the live rows of a component column.
+        """
+        return self._columns[name][:self.size]
+
+    def _reserve(self, count: int) -> None:
+        needed = self.size + count
+
+        if needed <= self.capacity:
+            return
+
+        capacity = max(needed, self.capacity * 2)
+
+        entities = np.empty(capacity, dtype=np.int64)
+        entities[:self.size] = self.entities
+        self._entities = entities
+
+        for name, column in self._columns.items():
+            grown = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def _append(self, entities: NDArray[np.int64], values: dict[str, Any]) -> int:
+        count = len(entities)
+        self._reserve(count)
+
+        start = self.size
+        stop = start + count
+
+        self._entities[start:stop] = entities
+
+        for name, column in self._columns.items():
+            if name in values:
+                column[start:stop] = values[name]
+            else:
+                column[start:stop] = 0
+
+        self.size = stop
+        return start
+
+    def _remove(self, row: int) -> Optional[int]:
+        """
+        Removes a row by swapping the last row into it.\n
+        Returns the id of the entity that was moved into `row`, if any.
+        """
+        last = self.size - 1
+        moved: Optional[int] = None
+
+        if row != last:
+            self._entities[row] = self._entities[last]
+
+            for column in self._columns.values():
+                column[row] = column[last]
+
+            moved = int(self._entities[row])
+
+        self.size = last
+        return moved
+
+
+@dataclass
+class _RegisteredSystem:
+    func: BulkSystem
+    components: tuple[str, ...]
+    phase: Phase
+
+
+class World(System):
+    """
+    Opt-in, data-oriented alternative to `Component`.\n
+    Entities are plain integer ids, and their component data lives in typed NumPy columns grouped
+    by archetype (the set of components an entity has). Systems receive whole column views and
+    update every matching entity in one vectorized call, instead of one `update` call per object.\n
+    Structural changes (spawning and despawning entities, and adding or removing components) made
+    while a system or a `query` is running are deferred until it's done, since they move rows
+    around and can reallocate the columns whose views are being iterated over.
+
+    >>> world = World(game)
+    >>> world.register('pos', np.float32, (2,))
+    >>> world.register('vel', np.float32, (2,))
+    >>> world.spawn_many(50_000, pos=0, vel=np.random.randn(50_000, 2))
+    >>> @world.system('pos', 'vel')
+    ... def move(pos, vel):
+    ...     pos += vel * game.time.deltatime
+    """
+
+    def __init__(self, game: 'Game') -> None:
+        super().__init__(game)
+
+        self._types: dict[str, ComponentType] = {}
+        self._archetypes: dict[frozenset[str], Archetype] = {}
+        # entity id -> (archetype, row)
+        self._locations: dict[int, tuple[Archetype, int]] = {}
+        self._systems: list[_RegisteredSystem] = []
+
+        self._next_entity = 0
+        self._iterating = 0
+        # (entity, change) of the structural changes made while iterating, in order. the entity is
+        # `None` for spawns.
+        self._pending: list[tuple[Optional[int], Callable[[], None]]] = []
+
+        self._game.before_update += lambda: self._run_phase('before_update')
+        self._game.on_update += lambda: self._run_phase('on_update')
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, entity: int) -> bool:
+        return entity in self._locations
+
+    @property
+    def archetypes(self) -> list[Archetype]:
+        return list(self._archetypes.values())
+
+    def register(self, name: str, dtype: DTypeLike = np.float32, shape: tuple[int, ...] = ()) -> None:
+        """
+        Registers a component type.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the component, used when spawning and querying.
+        dtype : `DTypeLike, optional`
+            The NumPy dtype of the column. `float32` by default.
+        shape : `tuple[int, ...], optional`
+            The per-entity shape of the component, `()` for scalars and `(2,)` for 2D vectors, for example.
+        """
+        self._types[name] = ComponentType(name, np.dtype(dtype), tuple(shape))
+
+    def spawn(self, **components: Any) -> int:
+        """
+        Creates a single entity with the given component values.\n
+        Prefer `spawn_many` when creating lots of entities at once. See `spawn_many` for spawning
+        while iterating.
+
+        Returns
+        -------
+        `int`
+            The id of the new entity.
+        """
+        return int(self.spawn_many(1, **{
+            name: np.asarray(value)[np.newaxis]
+            for name, value in components.items()
+        })[0])
+
+    def spawn_many(self, count: int, **components: Any) -> NDArray[np.int64]:
+        """
+        Creates `count` entities sharing the same set of components.\n
+        Each value may be a single value that gets broadcasted to every entity, or an array with
+        `count` rows.\n
+        If called from inside a system or a `query`, the ids are returned right away, but the
+        entities only exist once iteration ends.
+
+        Returns
+        -------
+        `NDArray[int64]`
+            The ids of the new entities.
+        """
+        archetype = self._get_archetype(frozenset(components))
+
+        entities = np.arange(self._next_entity, self._next_entity + count, dtype=np.int64)
+        self._next_entity += count
+
+        if self._iterating:
+            # copied, since they may be views of columns that change before the entities are added
+            values = {name: np.array(value) for name, value in components.items()}
+            self._pending.append((None, partial(self._spawn_now, archetype, entities, values)))
+        else:
+            self._spawn_now(archetype, entities, components)
+
+        return entities
+
+    def despawn(self, entity: int) -> None:
+        """
+        Destroys an entity.\n
+        If called from inside a system or a `query`, the entity is only removed once iteration
+        ends, so that the column views stay valid.
+        """
+        if self._iterating:
+            self._pending.append((entity, partial(self._despawn_now, entity)))
+        else:
+            self._despawn_now(entity)
+
+    def get(self, entity: int, name: str) -> Any:
+        """
+        Returns the value of one of an entity's components.\n
+        For non-scalar components this is a view that can be written to.
+        """
+        archetype, row = self._locations[entity]
+        return archetype._columns[name][row]
+
+    def set(self, entity: int, name: str, value: Any) -> None:
+        """
+        Sets the value of one of an entity's components, adding the component if the entity
+        doesn't have it yet (which moves the entity to another archetype).\n
+        Adding a component from inside a system or a `query` is deferred until iteration ends, like
+        `despawn`.
+        """
+        if self._iterating:
+            location = self._locations.get(entity)
+
+            if location is None or name not in location[0].signature:
+                # copied, in case it's a view of a column that changes before it's applied
+                self._pending.append((entity, partial(self.set, entity, name, np.array(value))))
+                return
+
+        archetype, row = self._locations[entity]
+
+        if name in archetype.signature:
+            archetype._columns[name][row] = value
+            return
+
+        self._move(entity, archetype.signature | {name}, {name: value})
+
+    def remove(self, entity: int, name: str) -> None:
+        """
+        Removes a component from an entity, moving it to another archetype.\n
+        Doesn't raise exception if the entity doesn't have the component. Deferred until iteration
+        ends if called from inside a system or a `query`, like `despawn`.
+        """
+        if self._iterating:
+            self._pending.append((entity, partial(self.remove, entity, name)))
+            return
+
+        archetype, _ = self._locations[entity]
+
+        if name in archetype.signature:
+            self._move(entity, archetype.signature - {name}, {})
+
+    def query(self, *names: str) -> Iterator[tuple[NDArray[Any], ...]]:
+        """
+        Iterates over every archetype that has all of the given components, yielding a tuple with
+        a view of each of the requested columns.\n
+        Structural changes are deferred until the iteration ends (or the iterator is closed).
+        """
+        required = frozenset(names)
+        self._iterating += 1
+
+        try:
+            for archetype in list(self._archetypes.values()):
+                if archetype.size and required <= archetype.signature:
+                    yield tuple(archetype.view(name) for name in names)
+        finally:
+            self._iterating -= 1
+
+            if not self._iterating and self._pending:
+                self._apply_pending()
+
+    def system(self, *names: str, phase: Phase = 'update') -> Callable[[BulkSystem], BulkSystem]:
+        """
+        Decorator that registers a bulk system.\n
+        The decorated function is called once per matching archetype with a view of each of the
+        requested columns, in order.
+
+        Parameters
+        ----------
+        *names : `str`
+            The components the system works with.
+        phase : `Phase, optional`
+            When the system runs. `update` (the default) runs with the other `System`s, before
+            `Game.before_update`, while `before_update` and `on_update` run along with those events.
+        """
+        def decorator(func: BulkSystem) -> BulkSystem:
+            self._systems.append(_RegisteredSystem(func, names, phase))
+            return func
+
+        return decorator
+
+    def remove_system(self, func: BulkSystem) -> None:
+        self._systems = [s for s in self._systems if s.func is not func]
+
+    def update(self) -> None:
+        self._run_phase('update')
+
+    def _snapshot_state(self) -> dict[str, Any]:
+        # only the live rows are saved. they're contiguous, so `snapshot` can write them as raw buffers.
+        return {
+            'types': self._types,
+            'next_entity': self._next_entity,
+            'archetypes': [
+                (archetype.types, archetype.entities, {name: archetype.view(name) for name in archetype.signature})
+                for archetype in self._archetypes.values()
+            ]
+        }
+
+    def _restore_snapshot_state(self, state: dict[str, Any]) -> None:
+        self._types = state['types']
+        self._next_entity = state['next_entity']
+        self._archetypes = {}
+        self._locations = {}
+        self._pending = []
+
+        for types, entities, columns in state['archetypes']:
+            archetype = Archetype(types, capacity=0)
+            # the loaded arrays are used as they are (memory-mapped, when loaded from a file), and
+            # only get copied if the archetype has to grow
+            archetype._entities = entities
+            archetype._columns = columns
+            archetype.size = len(entities)
+
+            self._archetypes[archetype.signature] = archetype
+            self._locations.update(zip(entities.tolist(), zip(repeat(archetype), range(len(entities)))))
+
+    def _run_phase(self, phase: Phase) -> None:
+        self._iterating += 1
+
+        try:
+            for system in self._systems:
+                if system.phase == phase:
+                    for columns in self.query(*system.components):
+                        system.func(*columns)
+        finally:
+            self._iterating -= 1
+
+        if not self._iterating and self._pending:
+            self._apply_pending()
+
+    def _apply_pending(self) -> None:
+        pending = self._pending
+        self._pending = []
+
+        for entity, change in pending:
+            # changes to entities that an earlier change despawned are dropped
+            if entity is None or entity in self._locations:
+                change()
+
+    def _get_archetype(self, signature: frozenset[str]) -> Archetype:
+        if (archetype := self._archetypes.get(signature)) is None:
+            try:
+                types = tuple(self._types[name] for name in sorted(signature))
+            except KeyError as e:
+                raise KeyError(f'Component "{e.args[0]}" was not registered!') from None
+
+            archetype = self._archetypes[signature] = Archetype(types)
+
+        return archetype
+
+    def _spawn_now(self, archetype: Archetype, entities: NDArray[np.int64], components: dict[str, Any]) -> None:
+        start = archetype._append(entities, components)
+
+        for offset, entity in enumerate(entities.tolist()):
+            self._locations[entity] = (archetype, start + offset)
+
+    def _despawn_now(self, entity: int) -> None:
+        archetype, row = self._locations.pop(entity)
+
+        if (moved := archetype._remove(row)) is not None:
+            self._locations[moved] = (archetype, row)
+
+    def _move(self, entity: int, signature: frozenset[str], values: dict[str, Any]) -> None:
+        old, row = self._locations[entity]
+        new = self._get_archetype(signature)
+
+        carried = {
+            name: old._columns[name][row:row + 1].copy()
+            for name in old.signature & signature
+        }
+        carried.update({
+            name: np.asarray(value)[np.newaxis]
+            for name, value in values.items()
+        })
+
+        self._despawn_now(entity)
+
+        start = new._append(np.array([entity], dtype=np.int64), carried)
+        self._locations[entity] = (new, start)
+
+
+@dataclass(slots=True)
+class CircleBatch(Renderable):
+    """
+    Draws one circle per entity of a `World` that has a position and a radius component, feeding
+    the entity data straight to `Rendering` without any intermediate `Circle` objects.\n
+    World to pixel conversion and off-screen culling are done in bulk with NumPy.
+    """
+    world: World
+    pos_component: str = 'pos'
+    radius_component: str = 'radius'
+    fill_color: Optional[Color] = None
+    color_component: Optional[str] = None
+
+    def draw(self) -> None:
+        camera = self._game.camera
+        surface = self._game.window.surface
+        width, height = surface.get_size()
+
+        # the camera is an affine transform, so instead of duplicating its math here we recover
+        # the transform from a couple of converted points.
+        origin = camera.world_to_pixel_pos(Vector2(0, 0))
+        scale = np.array([
+            camera.world_to_pixel_pos(Vector2(1, 0)).x - origin.x,
+            camera.world_to_pixel_pos(Vector2(0, 1)).y - origin.y
+        ])
+        radius_scale = camera.world_to_pixel_scale(1)
+
+        names = [self.pos_component, self.radius_component]
+
+        if self.color_component is not None:
+            names.append(self.color_component)
+
+        culled = 0
+
+        for columns in self.world.query(*names):
+            pixel_pos = columns[0] * scale + (origin.x, origin.y)
+            pixel_radius = columns[1] * radius_scale
+
+            visible = (
+                (pixel_pos[:, 0] > -pixel_radius) & (pixel_pos[:, 0] < width + pixel_radius) &
+                (pixel_pos[:, 1] > -pixel_radius) & (pixel_pos[:, 1] < height + pixel_radius)
+            )
+
+            culled += len(visible) - int(np.count_nonzero(visible))
+
+            xs = pixel_pos[visible, 0].astype(np.int32).tolist()
+            ys = pixel_pos[visible, 1].astype(np.int32).tolist()
+            radii = pixel_radius[visible].astype(np.int32).tolist()
+
+            if self.color_component is not None:
+                colors = [tuple(c) for c in columns[2][visible].tolist()]
+
+                for x, y, r, color in zip(xs, ys, radii, colors):
+                    gfxdraw.filled_circle(surface, x, y, r, color)
+
+            elif self.fill_color is not None:
+                color = self.fill_color
+
+                for x, y, r in zip(xs, ys, radii):
+                    gfxdraw.filled_circle(surface, x, y, r, color)
+
+        if self._game.profiler is not None:
+            self._game.profiler.count('culls', culled)
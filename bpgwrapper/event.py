@@ -1,5 +1,11 @@
 from abc import ABC
-from typing import Any, Callable, Generic, TypeVar
+from dataclasses import dataclass
+from types import MethodType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generic, Optional, TypeVar, overload
+from weakref import WeakMethod, ref
+
+if TYPE_CHECKING:
+    from .profiling import Profiler
 
 
 EH = TypeVar('EH', bound=Callable[..., None])
@@ -7,53 +13,177 @@ NoArgEvent = Callable[[], None]
 EventSelf = TypeVar('EventSelf', bound='Event[Any]')
 
 
+@dataclass
+class _Handler(Generic[EH]):
+    # either the handler itself, or a weak reference to it
+    target: Any
+    weak: bool
+    priority: int
+    order: int
+
+
+def _key(handler: Any, weak: bool) -> Any:
+    # bound methods are created anew on every attribute access, so they're identified by their
+    # object and function (like they compare). weak handlers are identified by their id instead of
+    # themselves, so that the key doesn't keep them alive.
+    if isinstance(handler, MethodType):
+        return id(handler.__self__), handler.__func__
+    return id(handler) if weak else handler
+
+
 class Event(ABC, Generic[EH]):
+    # the profiler of the game whose profiled frame is running, if any, so that handlers get timed.
+    # only set for the duration of the frame (see `Game._profiled_step`), so events fired by other
+    # games or outside of frames aren't timed.
+    _profiler: ClassVar[Optional['Profiler']] = None
+
     def __init__(self) -> None:
-        self._handlers: set[EH] = set()
+        # entries by `_key`, so that adding and removing handlers doesn't have to search for them
+        self._handlers: dict[Any, _Handler[EH]] = {}
+        self._order = 0
+
+        # immutable, priority-ordered copy of the handlers that `invoke` loops over. it's only
+        # rebuilt (lazily) after handlers change, which also means that adding or removing
+        # handlers from inside a handler doesn't affect the dispatch that is currently running.
+        self._snapshot: Optional[tuple[Any, ...]] = ()
+        self._snapshot_weak: Optional[tuple[bool, ...]] = None
 
     def __iadd__(self: EventSelf, handler: EH) -> EventSelf:
         """
-        Adds a handler to this `Event`'s set of handlers.
+        Adds a handler to this `Event`'s handlers, with the default priority.
         """
-        self._handlers.add(handler)
+        self.add(handler)
         return self
 
     def __isub__(self: EventSelf, handler: EH) -> EventSelf:
         """
-        Removes a handler from this `Event`'s set of handlers.\n
+        Removes a handler from this `Event`'s handlers.\n
         Doesn't raise exception if handler is not found.
         """
-        self._handlers.discard(handler)
+        self.remove(handler)
         return self
 
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    @overload
+    def __call__(self, func: EH, /) -> EH: ...
+
+    @overload
+    def __call__(self, *, priority: int = 0, weak: bool = False) -> Callable[[EH], EH]: ...
+
     # should this really be called a decorator?
-    # i mean it works like one but it doesn't actually decorate `func` it simply adds it to a set.
-    def __call__(self, func: EH) -> EH:
+    # i mean it works like one but it doesn't actually decorate `func` it simply adds it to the handlers.
+    def __call__(
+        self,
+        func: Optional[EH] = None,
+        /, *,
+        priority: int = 0,
+        weak: bool = False
+    ) -> EH | Callable[[EH], EH]:
         """
-        Allows `Event` instances to be used as decorators.\n
-        Adds the decorated `func` to the set of handlers, and returns it.
+        Allows `Event` instances to be used as decorators, either bare (`@event`) or with
+        arguments (`@event(priority=10)`).\n
+        Adds the decorated `func` to the handlers, and returns it.
 
         Parameters
         ----------
         func : `EH`
-            The callable being decorated, that will be added to the set of event handlers.
+            The callable being decorated, that will be added to the event handlers.
+        priority : `int, optional`
+            See `add`.
+        weak : `bool, optional`
+            See `add`.
 
         Returns
         -------
         `EH`
             The callable that was decorated.
         """
-        self += func
-        return func
+        if func is not None:
+            return self.add(func, priority=priority, weak=weak)
+
+        return lambda f: self.add(f, priority=priority, weak=weak)
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({len(self._handlers)} handlers)'
 
+    def add(self, handler: EH, *, priority: int = 0, weak: bool = False) -> EH:
+        """
+        Adds a handler to this `Event`.\n
+        Adding a handler that was already added does nothing.
+
+        Parameters
+        ----------
+        handler : `EH`
+            The handler to be added.
+        priority : `int, optional`
+            Handlers with higher priorities are called first. Handlers with the same priority are
+            called in the order they were added.
+        weak : `bool, optional`
+            Whether to only keep a weak reference to the handler, so that e.g. a removed
+            `Component` whose method is a handler can still be garbage collected. The handler is
+            removed automatically once it dies.
+
+        Returns
+        -------
+        `EH`
+            The handler that was added.
+        """
+        if self._find(handler) is not None:
+            return handler
+
+        target: Any = handler
+        key = _key(handler, weak)
+
+        if weak:
+            died = lambda target: self._on_handler_died(key, target)  # noqa: E731
+
+            if isinstance(handler, MethodType):
+                target = WeakMethod(handler, died)
+            else:
+                target = ref(handler, died)
+
+        self._handlers[key] = _Handler(target, weak, priority, self._order)
+        self._order += 1
+        self._snapshot = None
+
+        return handler
+
+    def remove(self, handler: EH) -> None:
+        """
+        Removes a handler from this `Event`.\n
+        Doesn't raise exception if handler is not found.
+        """
+        if (key := self._find(handler)) is not None:
+            del self._handlers[key]
+            self._snapshot = None
+
     def invoke(self, *args: Any, **kwargs: Any) -> None:
         """
-        Invokes this `Event`.
+        Invokes this `Event`, calling its handlers in order of priority.
         """
-        for handler in self._handlers:
+        snapshot = self._snapshot
+
+        if snapshot is None:
+            snapshot = self._rebuild_snapshot()
+
+        if not snapshot:
+            return
+
+        if Event._profiler is not None:
+            Event._profiler._invoke(self._live_handlers(), args, kwargs)
+            return
+
+        if self._snapshot_weak is None:
+            for handler in snapshot:
+                handler(*args, **kwargs)
+            return
+
+        for handler, weak in zip(snapshot, self._snapshot_weak):
+            if weak and (handler := handler()) is None:
+                continue
+
             handler(*args, **kwargs)
 
     def clear(self) -> None:
@@ -61,3 +191,41 @@ class Event(ABC, Generic[EH]):
         Clears all handlers attached to this `Event`.
         """
         self._handlers.clear()
+        self._snapshot = None
+
+    def _find(self, handler: EH) -> Any:
+        """
+        Returns the key of `handler`'s entry, whether it was added weakly or not, or `None`.
+        """
+        for weak in (False, True):
+            if (key := _key(handler, weak)) in self._handlers:
+                return key
+        return None
+
+    def _rebuild_snapshot(self) -> tuple[Any, ...]:
+        ordered = sorted(self._handlers.values(), key=lambda e: (-e.priority, e.order))
+
+        self._snapshot = tuple(e.target for e in ordered)
+        # most events have no weak handlers, and those get to skip dereferencing entirely
+        self._snapshot_weak = tuple(e.weak for e in ordered) if any(e.weak for e in ordered) else None
+
+        return self._snapshot
+
+    def _live_handlers(self) -> list[EH]:
+        snapshot = self._snapshot or ()
+
+        if self._snapshot_weak is None:
+            return list(snapshot)
+
+        return [
+            handler
+            for target, weak in zip(snapshot, self._snapshot_weak)
+            if (handler := target() if weak else target) is not None
+        ]
+
+    def _on_handler_died(self, key: Any, target: Any) -> None:
+        entry = self._handlers.get(key)
+
+        if entry is not None and entry.target is target:
+            del self._handlers[key]
+            self._snapshot = None
@@ -0,0 +1,201 @@
+import struct
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from pygame.math import Vector2
+from pygame.surface import Surface
+
+
+class FrameBuffer:
+    """
+    Memory that `Window` renders into instead of the display surface once set as its
+    `frame_buffer`. Frames are stored as RGBX pixels in NumPy arrays that the surfaces drawn on
+    share memory with, so they can be read without copying or locking any surface.\n
+    The size of a frame buffer is fixed, regardless of the window's size.
+
+    >>> game.window.frame_buffer = FrameBuffer(game.window.size)
+    >>> game.step()
+    >>> model.feed(game.window.frame)
+    """
+
+    def __init__(self, size: Vector2 | tuple[int, int]) -> None:
+        self.width, self.height = int(size[0]), int(size[1])
+        self._setup_slots([np.zeros((self.height, self.width, 4), dtype=np.uint8)])
+
+    @property
+    def surface(self) -> Surface:
+        """
+        The surface the current frame is being drawn on.
+        """
+        return self._surfaces[self._back]
+
+    @property
+    def frame(self) -> NDArray[np.uint8]:
+        """
+        The last finished frame, as a `(height, width, 3)` RGB view.
+        """
+        return self._slots[self._front][..., :3]
+
+    def present(self) -> None:
+        """
+        Called by `Window` once a frame has been drawn.
+        """
+
+    def _setup_slots(self, slots: list[NDArray[np.uint8]]) -> None:
+        self._slots = slots
+        # `frombuffer` surfaces reference the arrays' memory instead of copying it
+        self._surfaces = [pygame.image.frombuffer(slot, (self.width, self.height), 'RGBX') for slot in slots]
+        self._front = 0
+        self._back = 0
+
+
+# shared memory layout:
+#   header: frame sequence number, width, height, offset of each slot, padded to `_ALIGNMENT`
+#   two slots of `height * width * 4` bytes, each aligned to `_ALIGNMENT` bytes
+# the slot holding the latest finished frame is `sequence % 2`, and the other one is being drawn on.
+_HEADER = struct.Struct('<QIIQQ')
+_SEQUENCE = struct.Struct('<Q')
+_ALIGNMENT = 64
+
+
+class SharedFrameBuffer(FrameBuffer):
+    """
+    `FrameBuffer` in a `multiprocessing.shared_memory` block, so that another process can read
+    finished frames (see `SharedFrameReader`) without copying them.\n
+    It's double-buffered: frames are drawn on one slot while the other one holds the last finished
+    frame, and a sequence number is incremented whenever a frame is finished. Readers use it to
+    detect if a frame was overwritten while they were reading it, like a seqlock.
+
+    Parameters
+    ----------
+    size : `Vector2 | tuple[int, int]`
+        The size of the frames.
+    name : `Optional[str], optional`
+        The name of the shared memory block, random by default. See `name`.
+    """
+
+    def __init__(self, size: Vector2 | tuple[int, int], name: Optional[str] = None) -> None:
+        self.width, self.height = int(size[0]), int(size[1])
+
+        slot_size = self.width * self.height * 4
+        first = _align(_HEADER.size)
+        second = _align(first + slot_size)
+
+        self._memory = SharedMemory(name, create=True, size=second + slot_size)
+        _HEADER.pack_into(self._memory.buf, 0, 0, self.width, self.height, first, second)
+
+        self._setup_slots([
+            _slot_view(self._memory, offset, self.width, self.height)
+            for offset in (first, second)
+        ])
+
+        self.sequence = 0
+        # slot 0 holds the (empty) finished frame 0, so frame 1 is drawn on slot 1
+        self._back = 1
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory block, which readers attach to.
+        """
+        return self._memory.name
+
+    def present(self) -> None:
+        self.sequence += 1
+        _SEQUENCE.pack_into(self._memory.buf, 0, self.sequence)
+
+        self._front = self._back
+        self._back = 1 - self._back
+
+    def close(self) -> None:
+        """
+        Frees the shared memory. The frame buffer can't be used afterwards.
+        """
+        self._surfaces.clear()
+        self._slots.clear()
+        self._memory.close()
+        self._memory.unlink()
+
+
+class SharedFrameReader:
+    """
+    Reads the frames of a `SharedFrameBuffer` from another process.
+
+    >>> reader = SharedFrameReader(name)
+    >>> sequence, frame = reader.latest()
+    >>> features = model(frame)
+    >>> if not reader.is_current(sequence):
+    ...     ...  # the frame was overwritten while being read, so `features` may be torn
+    """
+
+    def __init__(self, name: str) -> None:
+        self._memory = SharedMemory(name)
+        _, self.width, self.height, first, second = _HEADER.unpack_from(self._memory.buf)
+
+        self._slots = [
+            _slot_view(self._memory, offset, self.width, self.height)[..., :3]
+            for offset in (first, second)
+        ]
+
+    @property
+    def sequence(self) -> int:
+        """
+        How many frames have been finished so far.
+        """
+        return int(_SEQUENCE.unpack_from(self._memory.buf)[0])
+
+    def latest(self) -> tuple[int, NDArray[np.uint8]]:
+        """
+        Returns the sequence number of the latest finished frame and a `(height, width, 3)` RGB
+        view of it. The view isn't a copy, so it's only valid as long as `is_current` says so.
+        """
+        sequence = self.sequence
+        return sequence, self._slots[sequence % 2]
+
+    def is_current(self, sequence: int) -> bool:
+        """
+        Whether the frame with this sequence number is still intact, i.e. the writer hasn't
+        started drawing over it.
+        """
+        # the writer only starts drawing on a slot after finishing the frame in the other one
+        return self.sequence == sequence
+
+    def read(self, out: Optional[NDArray[np.uint8]] = None) -> tuple[int, NDArray[np.uint8]]:
+        """
+        Copies the latest finished frame, retrying if it's overwritten in the meantime, so the
+        copy is never torn.
+
+        Parameters
+        ----------
+        out : `Optional[NDArray[np.uint8]], optional`
+            A `(height, width, 3)` array to copy into, instead of allocating a new one.
+
+        Returns
+        -------
+        `tuple[int, NDArray[np.uint8]]`
+            The frame's sequence number and the copy.
+        """
+        if out is None:
+            out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        while True:
+            sequence, frame = self.latest()
+            np.copyto(out, frame)
+
+            if self.is_current(sequence):
+                return sequence, out
+
+    def close(self) -> None:
+        self._slots.clear()
+        self._memory.close()
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _slot_view(memory: SharedMemory, offset: int, width: int, height: int) -> NDArray[np.uint8]:
+    return np.ndarray((height, width, 4), dtype=np.uint8, buffer=memory.buf, offset=offset)
@@ -1,59 +1,152 @@
-from typing import Callable, Iterator, Type, TypeVar, cast
+from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Type, TypeVar, cast
 
 import pygame
 
-from ._systems import *
+from ._systems import resolve_systems
 from .core import Component, System
 from .event import Event, NoArgEvent
 
+if TYPE_CHECKING:
+    from ._systems import *
+    from .profiling import Profiler
+
 
 CL = TypeVar('CL', bound=Component)
 
 
 class Game:
-    def __init__(self) -> None:
-        pygame.init()
+    """
+    Parameters
+    ----------
+    systems : `Optional[Iterable[str]], optional`
+        The names of the built-in systems to create, e.g. `['time', 'scheduling', 'collision']` for
+        a headless simulation. The systems they use are added automatically.\n
+        Only the pygame modules that these systems need are initialized, and the modules of the
+        other systems aren't even imported, which makes startup a lot faster. By default every
+        system is created and `pygame.init` is called.
+    """
+
+    # only the ones in the game's configuration exist
+    time: 'Time'
+    events: 'Events'
+    scheduling: 'Scheduling'
+    mouse: 'Mouse'
+    keyboard: 'Keyboard'
+    collision: 'Collision'
+    camera: 'Camera'
+    rendering: 'Rendering'
+    window: 'Window'
+
+    def __init__(self, systems: Optional[Iterable[str]] = None) -> None:
+        system_types = resolve_systems(systems)
+
+        if systems is None:
+            pygame.init()
+        else:
+            for module in {module for cls in system_types for module in cls.pygame_modules}:
+                getattr(pygame, module).init()
+
+        # in the order they were added, see `systems` for the order they run in
+        self._systems: list[System] = []
+        # `(systems, update methods, post_update methods)`, in the order they run in. `None` when
+        # systems were added or removed, so that it's resolved again before the next frame.
+        self._pipeline: Optional[tuple[list[System], list[Callable[[], None]], list[Callable[[], None]]]] = None
 
-        self.systems: list[System] = []
         self.components: list[Component] = []
 
+        # set by `Profiler.enabled`
+        self.profiler: Optional['Profiler'] = None
+
         self.on_start = Event[NoArgEvent]()
         self.before_update = Event[NoArgEvent]()
         self.on_update = Event[NoArgEvent]()
         self.on_quit = Event[NoArgEvent]()
 
-        # changing the order of some stuff here will cause problems
-        self.time = Time(self)
-        self.events = Events(self)
-        self.scheduling = Scheduling(self)
-        self.mouse = Mouse(self)
-        self.keyboard = Keyboard(self)
-        self.camera = Camera(self)
-        self.rendering = Rendering(self)
-        self.window = Window(self)
+        # used instead of a QUIT event when there's no `Events` system to read it
+        self._quit_requested = False
+
+        # what `frame_cached` properties are keyed on, see `invalidate_frame_cache`
+        self._cache_epoch = 0
+
+        for cls in system_types:
+            setattr(self, cls.name, cls(self))
+
+    @property
+    def systems(self) -> tuple[System, ...]:
+        """
+        The game's systems, in the order they run in: the order they were added in, except that
+        systems are moved before the ones that declare they run `after` them (and vice-versa for
+        `before`).\n
+        This is a read-only view, use `add_system` and `remove_system` to change the systems.
+        """
+        return tuple(self._resolve_pipeline()[0])
+
+    def add_system(self, system: System) -> None:
+        """
+        Adds a system to the pipeline. Systems do this themselves when they're created.\n
+        Takes effect from the next phase on.
+        """
+        self._systems.append(system)
+        self._pipeline = None
+
+    def remove_system(self, system: System) -> None:
+        """
+        Removes a system from the pipeline, so that it doesn't run anymore, and calls its
+        `removed`.\n
+        Doesn't raise exception if the system wasn't added.
+        """
+        if system in self._systems:
+            self._systems.remove(system)
+            self._pipeline = None
+            system.removed()
 
     def mainloop(self) -> None:
         self.on_start.invoke()
 
         while not self._should_quit():
-            for system in self.systems:
-                system.update()
+            if self.profiler is None:
+                self.step()
+            else:
+                self._profiled_step(self.profiler)
+
+        self.on_quit.invoke()
 
-            self.before_update.invoke()
+        pygame.quit()
 
-            for component in self.components:
-                component.update()
+    def step(self) -> None:
+        """
+        Runs a single frame.\n
+        `mainloop` calls this until the game quits, but it can also be used to drive the game
+        manually, e.g. in headless simulations and benchmarks.
+        """
+        _, updates, post_updates = self._resolve_pipeline()
+        self._cache_epoch += 1
 
-            self.on_update.invoke()
+        for update in updates:
+            update()
 
-            for system in self.systems:
-                system.post_update()
+        self.before_update.invoke()
 
-            self._cleanup()
+        for component in self.components:
+            component.update()
 
-        self.on_quit.invoke()
+        self.on_update.invoke()
 
-        pygame.quit()
+        # resolved again, in case systems were added or removed during the frame
+        for post_update in self._resolve_pipeline()[2]:
+            post_update()
+
+        self._cleanup()
+
+    def invalidate_frame_cache(self) -> None:
+        """
+        Makes every `frame_cached` property be computed again. This already happens every frame,
+        and when the camera is moved (by setting `Camera.pos`) or the window changes, but changing
+        something they depend on in place (e.g. `camera.pos.x += 1`) isn't detected.
+        """
+        self._cache_epoch += 1
 
     def filter_components(self, pred_type_name: Callable[[Component], bool] | Type[CL] | str) -> Iterator[CL]:
         pred: Callable[[Component], bool]
@@ -76,15 +169,157 @@ class Game:
 
         self.components.append(component)
 
+    def save_snapshot(self, path: Path | str) -> None:
+        """
+        Saves the state of the game (components, renderables, colliders, the camera, `Time`'s
+        counters and ECS worlds) to a binary file that can be restored with `load_snapshot`.\n
+        Shapes, colliders, vectors and colors are written as columns of raw buffers, as is other
+        array-backed state, which are memory-mapped when the snapshot is loaded. Only the rest of
+        the state (e.g. components) is pickled.
+        Running coroutines can't be saved, so they are kept as they are when loading.
+        """
+        from .snapshot import save_snapshot
+        save_snapshot(self, path)
+
+    def load_snapshot(self, path: Path | str) -> None:
+        """
+        Restores a snapshot saved with `save_snapshot`.\n
+        The game must have been set up the same way as the one that was saved, since systems are
+        referenced by their position in `systems`.
+        """
+        from .snapshot import load_snapshot
+        load_snapshot(self, path)
+
     def quit(self) -> None:
-        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        if hasattr(self, 'events'):
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        else:
+            self._quit_requested = True
 
     def _should_quit(self) -> bool:
+        if not hasattr(self, 'events'):
+            return self._quit_requested
+
         return cast(bool, self.events.get(pygame.QUIT))
 
+    # same as `step`, except every phase and system is timed. kept separate so that `step` doesn't
+    # pay for any of this when profiling is disabled.
+    def _profiled_step(self, profiler: 'Profiler') -> None:
+        previous = Event._profiler
+        Event._profiler = profiler
+
+        try:
+            self._timed_step(profiler)
+        finally:
+            Event._profiler = previous
+
+    def _timed_step(self, profiler: 'Profiler') -> None:
+        profiler.begin_frame()
+        self._cache_epoch += 1
+
+        start = perf_counter_ns()
+        for update in self._resolve_pipeline()[1]:
+            system_start = perf_counter_ns()
+            update()
+            profiler.record(f'{update.__self__.__class__.__name__}.update', system_start, 'system')  # type: ignore
+        profiler.record('update', start)
+
+        start = perf_counter_ns()
+        self.before_update.invoke()
+        profiler.record('before_update', start)
+
+        start = perf_counter_ns()
+        for component in self.components:
+            component.update()
+        profiler.record('components', start)
+
+        start = perf_counter_ns()
+        self.on_update.invoke()
+        profiler.record('on_update', start)
+
+        start = perf_counter_ns()
+        for post_update in self._resolve_pipeline()[2]:
+            system_start = perf_counter_ns()
+            post_update()
+            profiler.record(f'{post_update.__self__.__class__.__name__}.post_update', system_start, 'system')  # type: ignore
+        profiler.record('post_update', start)
+
+        start = perf_counter_ns()
+        self._cleanup()
+        profiler.record('cleanup', start)
+
+        profiler.end_frame()
+
+    def _resolve_pipeline(self) -> tuple[list[System], list[Callable[[], None]], list[Callable[[], None]]]:
+        if self._pipeline is None:
+            systems = _order_systems(self._systems)
+
+            # systems only take part in the phases they override, so frames don't waste calls on
+            # the empty `System` methods
+            self._pipeline = (
+                systems,
+                [system.update for system in systems if type(system).update is not System.update],
+                [system.post_update for system in systems if type(system).post_update is not System.post_update]
+            )
+
+        return self._pipeline
+
     def _cleanup(self) -> None:
         self.components = [
             component
             for component in self.components
             if not component.should_remove()
         ]
+
+
+def _order_systems(systems: list[System]) -> list[System]:
+    """
+    Sorts systems so that each one comes after the ones it declares it runs `after`, and before
+    the ones it declares it runs `before`, otherwise keeping them in the order they're in.
+
+    Raises
+    ------
+    `ValueError`
+        If the declarations contradict each other.
+    """
+    by_name: dict[str, list[System]] = {}
+
+    for system in systems:
+        by_name.setdefault(system.name, []).append(system)
+
+    # the systems that must run before each system
+    previous: dict[int, list[System]] = {id(system): [] for system in systems}
+
+    for system in systems:
+        for name in system.after:
+            previous[id(system)].extend(by_name.get(name, ()))
+
+        for name in system.before:
+            for other in by_name.get(name, ()):
+                previous[id(other)].append(system)
+
+    ordered: list[System] = []
+    done: set[int] = set()
+    visiting: set[int] = set()
+
+    # depth first, so every system is placed as early as its position allows, with whatever has to
+    # run before it pulled right in front of it
+    def visit(system: System) -> None:
+        if id(system) in done:
+            return
+        if id(system) in visiting:
+            raise ValueError(f'The `after` and `before` of the "{system.name}" system are circular!')
+
+        visiting.add(id(system))
+
+        for other in previous[id(system)]:
+            visit(other)
+
+        visiting.discard(id(system))
+        done.add(id(system))
+        ordered.append(system)
+
+    for system in systems:
+        visit(system)
+
+    return ordered
@@ -0,0 +1,200 @@
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from .core import System
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+class Governor(System):
+    """
+    Trades quality for speed to keep frames within a time budget.\n
+    Every `interval` frames, the `percentile`th percentile of the raw frame times measured by
+    `Time` over those frames is compared against the budget (`1 / target_framerate`): if it's
+    over, `degrade` is called, and if it's under the budget times `headroom`, `improve` is. The gap
+    in between keeps quality from bouncing back and forth.
+
+    Parameters
+    ----------
+    target_framerate : `float, optional`
+        The framerate whose frame time is the budget. 60 by default.
+    percentile : `float, optional`
+        Which percentile of the frame times must be within budget (0-100). 95 by default, so
+        that occasional spikes are ignored.
+    interval : `int, optional`
+        How many frames to measure between adjustments.
+    headroom : `float, optional`
+        The fraction of the budget frames must be under for quality to be improved.
+    """
+
+    requires = ('time',)
+    # frame times are measured in `Time.post_update`
+    after = ('time',)
+
+    def __init__(
+        self,
+        game: 'Game',
+        target_framerate: float = 60, *,
+        percentile: float = 95,
+        interval: int = 30,
+        headroom: float = 0.8
+    ) -> None:
+        super().__init__(game)
+
+        self.target_framerate = target_framerate
+        self.percentile = percentile
+        self.interval = interval
+        self.headroom = headroom
+        self.enabled = True
+
+        self._frames = 0
+
+    @property
+    def load(self) -> float:
+        """
+        The measured frame time relative to the budget, e.g. `1.5` if frames take 50% too long.
+        """
+        frame_time = self._game.time.frame_time_percentile(self.percentile, self.interval)
+        return frame_time * self.target_framerate
+
+    def post_update(self) -> None:
+        if not self.enabled:
+            return
+
+        self._frames += 1
+
+        if self._frames < self.interval:
+            return
+
+        self._frames = 0
+        load = self.load
+
+        if load > 1:
+            self.degrade(load)
+        elif load < self.headroom:
+            self.improve(load)
+
+    def degrade(self, load: float) -> None:
+        """
+        Lowers quality, since frames take `load` times the budget.
+        """
+        raise NotImplementedError()
+
+    def improve(self, load: float) -> None:
+        """
+        Raises quality, since frames only take `load` times the budget.
+        """
+        raise NotImplementedError()
+
+
+class DynamicResolution(Governor):
+    """
+    Lowers `Window.render_scale` when frames take too long, and raises it back when there's time
+    to spare, see `Governor`.
+
+    >>> DynamicResolution(game, 60, min_scale=0.5)
+
+    Parameters
+    ----------
+    target_framerate, percentile, interval, headroom
+        See `Governor`.
+    min_scale : `float, optional`
+        The lowest render scale to go down to.
+    max_scale : `float, optional`
+        The highest render scale to go up to.
+    max_step : `float, optional`
+        How much the render scale can change per adjustment.
+    granularity : `float, optional`
+        The render scale is rounded to a multiple of this, so that the render surface isn't
+        recreated over tiny changes.
+    """
+
+    requires = ('time', 'window')
+
+    def __init__(
+        self,
+        game: 'Game',
+        target_framerate: float = 60, *,
+        min_scale: float = 0.5,
+        max_scale: float = 1,
+        max_step: float = 0.25,
+        granularity: float = 0.05,
+        percentile: float = 95,
+        interval: int = 30,
+        headroom: float = 0.8
+    ) -> None:
+        super().__init__(game, target_framerate, percentile=percentile, interval=interval, headroom=headroom)
+
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.max_step = max_step
+        self.granularity = granularity
+
+    def degrade(self, load: float) -> None:
+        self._rescale(load)
+
+    def improve(self, load: float) -> None:
+        self._rescale(load)
+
+    def _rescale(self, load: float) -> None:
+        window = self._game.window
+        current = window.render_scale
+
+        # drawing costs about as much as the amount of pixels, which goes with the scale squared.
+        # the scale aims for the middle of the headroom, so that it doesn't go right back.
+        goal = (1 + self.headroom) / 2
+        target = current * sqrt(goal / max(load, 1e-3))
+        target = min(current + self.max_step, max(current - self.max_step, target))
+        target = round(target / self.granularity) * self.granularity
+        target = min(self.max_scale, max(self.min_scale, target))
+
+        if target != current:
+            window.render_scale = target
+
+
+class QualityGovernor(Governor):
+    """
+    Turns off antialiasing, and then strokes, of every shape when frames take too long, and turns
+    them back on (in the opposite order) when there's time to spare, see `Governor` and
+    `Rendering.antialiasing`.
+
+    >>> QualityGovernor(game, 60)
+    """
+
+    requires = ('time', 'rendering')
+
+    # (antialiasing, strokes) from the highest quality to the lowest
+    LEVELS = ((True, True), (False, True), (False, False))
+
+    def __init__(
+        self,
+        game: 'Game',
+        target_framerate: float = 60, *,
+        percentile: float = 95,
+        interval: int = 30,
+        headroom: float = 0.8
+    ) -> None:
+        super().__init__(game, target_framerate, percentile=percentile, interval=interval, headroom=headroom)
+
+        self._level = 0
+
+    @property
+    def level(self) -> int:
+        """
+        The index of the current quality in `LEVELS`, `0` being the highest.
+        """
+        return self._level
+
+    @level.setter
+    def level(self, level: int) -> None:
+        self._level = min(len(self.LEVELS) - 1, max(0, level))
+
+        rendering = self._game.rendering
+        rendering.antialiasing, rendering.strokes = self.LEVELS[self._level]
+
+    def degrade(self, load: float) -> None:
+        self.level += 1
+
+    def improve(self, load: float) -> None:
+        self.level -= 1
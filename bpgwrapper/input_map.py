@@ -0,0 +1,151 @@
+from collections import namedtuple
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from .core import System
+from .enums import Key, MouseButton
+from .event import Event
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+Binding = Key | MouseButton
+Bindings = Binding | Iterable[Binding]
+InputChangeEvent = Callable[[str, float], None]
+
+
+class InputMap(System):
+    """
+    Named actions and axes, bound to keys and mouse buttons.\n
+    Bindings are declared once and compiled into bitmasks. The whole map is then evaluated once per
+    frame into `state`, a read-only snapshot whose fields are the actions (`bool`) and axes
+    (`-1`, `0` or `1`), so reading input is as cheap as reading an attribute.\n
+    `on_change` is only invoked for the actions and axes whose value changed this frame.\n
+    Like every system, a map runs until it's removed with `Game.remove_system`, so it should be
+    created once per set of controls and shared by whatever reads them, rather than once per object.\n
+    Mouse buttons can be bound even if the game has no `mouse` system, they're just never pressed.
+
+    >>> controls = InputMap(game)
+    >>> controls.axis('horizontal', Key.a, Key.d)
+    >>> controls.action('sprint', Key.left_shift, Key.right_shift)
+    >>> controls.state.horizontal
+    1
+    """
+
+    after = ('keyboard', 'mouse')
+
+    def __init__(self, game: 'Game') -> None:
+        super().__init__(game)
+
+        self._actions: dict[str, tuple[Binding, ...]] = {}
+        self._axes: dict[str, tuple[tuple[Binding, ...], tuple[Binding, ...]]] = {}
+
+        # (key mask, button mask) for every action, then (negative masks, positive masks) for
+        # every axis
+        self._compiled: tuple[list[tuple[int, int]], list[tuple[tuple[int, int], tuple[int, int]]]] = ([], [])
+
+        self.state: Any = None
+        self.previous_state: Any = None
+
+        self.on_change = Event[InputChangeEvent]()
+
+        self._compile()
+
+    def action(self, name: str, *bindings: Binding) -> None:
+        """
+        Declares (or redeclares) an action, which is `True` while any of its bindings is pressed.\n
+        It can be read from `state` right away, and is `False` until the next frame is evaluated.
+        """
+        self._actions[name] = bindings
+        self._compile()
+
+    def axis(self, name: str, negative: Bindings, positive: Bindings) -> None:
+        """
+        Declares (or redeclares) an axis, which is `-1` while any of the `negative` bindings is
+        pressed, `1` while any of the `positive` ones is, and `0` if both or neither are.\n
+        It can be read from `state` right away, and is `0` until the next frame is evaluated.
+        """
+        self._axes[name] = (_as_tuple(negative), _as_tuple(positive))
+        self._compile()
+
+    def remove(self, name: str) -> None:
+        self._actions.pop(name, None)
+        self._axes.pop(name, None)
+        self._compile()
+
+    def get(self, name: str) -> float:
+        return getattr(self.state, name)  # type: ignore
+
+    def get_down(self, name: str) -> bool:
+        """
+        Whether an action started being pressed this frame.
+        """
+        return bool(self.get(name)) and not getattr(self.previous_state, name, False)
+
+    def get_up(self, name: str) -> bool:
+        """
+        Whether an action stopped being pressed this frame.
+        """
+        return not self.get(name) and bool(getattr(self.previous_state, name, False))
+
+    def update(self) -> None:
+        actions, axes = self._compiled
+
+        keys = self._game.keyboard.pressed_bits
+        # games can be created without a mouse (see `Game`), in which case no buttons are pressed
+        buttons = self._game.mouse.pressed_bits if hasattr(self._game, 'mouse') else 0
+
+        values: list[float] = [
+            bool(keys & key_mask or buttons & button_mask)
+            for key_mask, button_mask in actions
+        ]
+        values.extend(
+            bool(keys & pos_keys or buttons & pos_buttons) - bool(keys & neg_keys or buttons & neg_buttons)
+            for (neg_keys, neg_buttons), (pos_keys, pos_buttons) in axes
+        )
+
+        state = self._state_type._make(values)
+
+        self.previous_state = self.state
+
+        if state != self.state:
+            for name, old, new in zip(state._fields, self.state, state):
+                if old != new:
+                    self.on_change.invoke(name, new)
+
+        self.state = state
+
+    def _compile(self) -> None:
+        self._compiled = (
+            [_masks(bindings) for bindings in self._actions.values()],
+            [(_masks(neg), _masks(pos)) for neg, pos in self._axes.values()]
+        )
+
+        fields = [*self._actions, *self._axes]
+        self._state_type = namedtuple('InputState', fields)  # type: ignore
+
+        # actions and axes that already existed keep their values, new ones start released
+        old = self.state._asdict() if self.state is not None else {}
+        self.state = self._state_type._make(old.get(name, False if name in self._actions else 0) for name in fields)
+
+
+def _as_tuple(bindings: Bindings) -> tuple[Binding, ...]:
+    if isinstance(bindings, (Key, MouseButton)):
+        return (bindings,)
+    return tuple(bindings)
+
+
+def _masks(bindings: Iterable[Binding]) -> tuple[int, int]:
+    # imported here so that importing the package doesn't import the keyboard system
+    from ._systems.keyboard import KEYS
+
+    key_mask = 0
+    button_mask = 0
+
+    for binding in bindings:
+        if isinstance(binding, Key):
+            key_mask |= 1 << KEYS.index(binding)
+        else:
+            button_mask |= 1 << binding.value
+
+    return key_mask, button_mask
@@ -0,0 +1,164 @@
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal
+
+from .utils import percentile, summarize
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+SpanCategory = Literal['frame', 'phase', 'system', 'handler']
+# name, category, start, duration
+Span = tuple[str, SpanCategory, int, int]
+
+
+class Profiler:
+    """
+    Opt-in frame profiler.\n
+    While enabled, `Game.mainloop` times every phase of the frame, every `System` and the handlers
+    of every `Event` invoked during the frame with `perf_counter_ns`, and `Rendering`/`Events`
+    report per-frame counters (draws, culls and events). Timings are kept for the last `history`
+    frames, and can be summarized as percentiles or exported as a Chrome trace
+    (`chrome://tracing`, Perfetto).\n
+    When disabled, the only cost left in the main loop is a `None` check per frame.
+
+    >>> profiler = Profiler(game)
+    >>> profiler.enabled = True
+    >>> game.mainloop()
+    >>> profiler.export_chrome_trace('trace.json')
+    """
+
+    def __init__(self, game: 'Game', history: int = 300, *, trace: bool = True) -> None:
+        self._game = game
+        self._history = history
+        self._enabled = False
+
+        self.trace = trace
+
+        self._timings: dict[str, deque[int]] = defaultdict(lambda: deque(maxlen=self._history))
+        self._counters: dict[str, deque[int]] = defaultdict(lambda: deque(maxlen=self._history))
+        self._frames: deque[tuple[int, list[Span], dict[str, int]]] = deque(maxlen=history)
+
+        self._frame_timings: dict[str, int] = defaultdict(int)
+        self._frame_counters: dict[str, int] = defaultdict(int)
+        self._frame_spans: list[Span] = []
+        self._frame_start = 0
+        self._origin = perf_counter_ns()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._enabled = value
+        self._game.profiler = self if value else None
+
+    @property
+    def frames_recorded(self) -> int:
+        return len(self._timings['frame'])
+
+    def begin_frame(self) -> None:
+        self._frame_timings.clear()
+        self._frame_counters.clear()
+        self._frame_spans = []
+        self._frame_start = perf_counter_ns()
+
+    def end_frame(self) -> None:
+        self.record('frame', self._frame_start, 'frame')
+
+        for name, total in self._frame_timings.items():
+            self._timings[name].append(total)
+
+        # counters that weren't touched this frame still count as zero
+        for name in self._counters.keys() | self._frame_counters.keys():
+            self._counters[name].append(self._frame_counters.get(name, 0))
+
+        if self.trace:
+            self._frames.append((self._frame_start, self._frame_spans, dict(self._frame_counters)))
+
+    def record(self, name: str, start: int, category: SpanCategory = 'phase') -> None:
+        """
+        Records a span that started at `start` (a `perf_counter_ns` timestamp) and ends now.\n
+        Spans with the same name in the same frame are summed up.
+        """
+        end = perf_counter_ns()
+        self._frame_timings[name] += end - start
+
+        if self.trace:
+            self._frame_spans.append((name, category, start, end - start))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Increments a per-frame counter, such as `draws`, `culls` or `events`.
+        """
+        self._frame_counters[name] += amount
+
+    def percentile(self, name: str, q: float) -> float:
+        """
+        Returns the `q`th percentile (0-100) of the time, in milliseconds, spent per frame on the
+        span called `name`, over the last `history` frames.
+        """
+        return percentile(self._timings.get(name, ()), q) / 1e6
+
+    def counter_percentile(self, name: str, q: float) -> float:
+        return percentile(self._counters.get(name, ()), q)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the mean, p50, p95, p99 and max of every span (in milliseconds) and counter.
+        """
+        summary = {
+            name: summarize(samples, scale=1e-6)
+            for name, samples in self._timings.items()
+        }
+        summary.update({
+            f'{name} (count)': summarize(samples)
+            for name, samples in self._counters.items()
+        })
+        return summary
+
+    def reset(self) -> None:
+        self._timings.clear()
+        self._counters.clear()
+        self._frames.clear()
+
+    def export_chrome_trace(self, path: Path | str) -> None:
+        """
+        Writes the recorded frames in the Chrome trace event format, which can be opened in
+        `chrome://tracing` or https://ui.perfetto.dev.
+        """
+        events: list[dict[str, Any]] = []
+
+        for frame_start, spans, counters in self._frames:
+            if counters:
+                events.append({
+                    'name': 'counters',
+                    'ph': 'C',
+                    'ts': (frame_start - self._origin) / 1000,
+                    'args': counters,
+                    'pid': 0,
+                    'tid': 0
+                })
+
+            for name, category, start, duration in spans:
+                events.append({
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': (start - self._origin) / 1000,
+                    'dur': duration / 1000,
+                    'pid': 0,
+                    'tid': 0
+                })
+
+        Path(path).write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+
+    def _invoke(self, handlers: Iterable[Callable[..., None]], args: Any, kwargs: Any) -> None:
+        for handler in handlers:
+            start = perf_counter_ns()
+            handler(*args, **kwargs)
+            self.record(getattr(handler, '__qualname__', repr(handler)), start, 'handler')
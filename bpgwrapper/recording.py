@@ -0,0 +1,244 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, Optional
+
+import pygame
+
+from ._systems.keyboard import KEYS
+from .core import System
+from .event import Event, NoArgEvent
+from .utils import vec2_to_int_tuple
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+# file layout:
+#   header: magic, format version, amount of keys, size of each frame record
+#   records: one fixed-size record per frame, see `_RECORD`
+# fixed-size records are what make recordings seekable and memory-mappable.
+_MAGIC = b'BPGINPUT'
+_VERSION = 1
+_HEADER = struct.Struct('<8sHHI')
+
+_KEY_BYTES = (len(KEYS) + 7) // 8
+# deltatime, pixel pos (x, y), pixel rel (x, y), scroll (x, y), buttons pressed, down and up
+# bitsets, followed by the keys pressed, down and up bitsets
+_RECORD = struct.Struct(f'<diiiiffBBB{_KEY_BYTES * 3}s')
+
+
+class InputFrame(NamedTuple):
+    deltatime: float
+    pixel_pos: tuple[int, int]
+    pixel_rel: tuple[int, int]
+    scroll: tuple[float, float]
+    buttons_pressed: int
+    buttons_down: int
+    buttons_up: int
+    keys_pressed: int
+    keys_down: int
+    keys_up: int
+
+
+class InputRecording:
+    """
+    Read-only, memory-mapped view of a file written by `InputRecorder`.\n
+    Frames are decoded on access, so even hours long recordings aren't loaded into memory.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, key_count, record_size = _HEADER.unpack_from(self._mmap)
+
+        if magic != _MAGIC:
+            raise ValueError(f'"{path}" is not an input recording!')
+        if version != _VERSION or key_count != len(KEYS) or record_size != _RECORD.size:
+            raise ValueError(f'"{path}" was recorded with an incompatible version of bpgwrapper!')
+
+        self._length = (len(self._mmap) - _HEADER.size) // _RECORD.size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> InputFrame:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('frame index out of range')
+
+        dt, x, y, rel_x, rel_y, scroll_x, scroll_y, btn_pressed, btn_down, btn_up, keys = _RECORD.unpack_from(
+            self._mmap,
+            _HEADER.size + index * _RECORD.size
+        )
+
+        return InputFrame(
+            dt,
+            (x, y),
+            (rel_x, rel_y),
+            (scroll_x, scroll_y),
+            btn_pressed,
+            btn_down,
+            btn_up,
+            int.from_bytes(keys[:_KEY_BYTES], 'little'),
+            int.from_bytes(keys[_KEY_BYTES:_KEY_BYTES * 2], 'little'),
+            int.from_bytes(keys[_KEY_BYTES * 2:], 'little')
+        )
+
+    def close(self) -> None:
+        """
+        Releases the memory map and the file. Frames can't be read afterwards.
+        """
+        self._mmap.close()
+        self._file.close()
+
+
+class InputRecorder(System):
+    """
+    Writes the keyboard and mouse state and the deltatime of every frame to a compact binary
+    file that can be replayed with `InputPlayer`.
+    """
+
+    after = ('keyboard', 'mouse')
+
+    def __init__(self, game: 'Game', path: Path | str) -> None:
+        super().__init__(game)
+
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, len(KEYS), _RECORD.size))
+
+        self.frames_recorded = 0
+
+        self._game.on_quit += self.close
+
+    def update(self) -> None:
+        if self._file is None:
+            return
+
+        keyboard = self._game.keyboard
+        mouse = self._game.mouse
+
+        keys = b''.join(
+            bits.to_bytes(_KEY_BYTES, 'little')
+            for bits in (keyboard.pressed_bits, keyboard.down_bits, keyboard.up_bits)
+        )
+        scroll = mouse.scroll_delta
+
+        self._file.write(_RECORD.pack(
+            self._game.time.deltatime,
+            # in the window's pixels, so that replays don't depend on the render scale
+            *vec2_to_int_tuple(mouse.window_pixel_pos),
+            *vec2_to_int_tuple(mouse.window_pixel_vel),
+            scroll.x,
+            scroll.y,
+            mouse.pressed_bits,
+            mouse.down_bits,
+            mouse.up_bits,
+            keys
+        ))
+
+        self.frames_recorded += 1
+
+    def removed(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class InputPlayer(System):
+    """
+    Feeds `Keyboard`, `Mouse` and `Time.deltatime` from a recording made with `InputRecorder`,
+    instead of reading any input from SDL.\n
+    Combined with a headless game this makes for a deterministic benchmark driver.
+
+    Parameters
+    ----------
+    game : `Game`
+        The game to replay the recording in.
+    path : `Path | str`
+        The path of the recording.
+    quit_on_finish : `bool, optional`
+        Whether to quit the game once the recording ends. If `False`, live input is used again.
+    loop : `bool, optional`
+        Whether to start over once the recording ends, instead of finishing.\n
+    The recording is closed once it finishes, when the player is removed from the game, or when
+    the game quits.
+    """
+
+    # the recorded state has to be in place before any other system reads it
+    before = ('time', 'events', 'scheduling', 'mouse', 'keyboard')
+
+    def __init__(
+        self,
+        game: 'Game',
+        path: Path | str, *,
+        quit_on_finish: bool = True,
+        loop: bool = False
+    ) -> None:
+        super().__init__(game)
+
+        self.recording = InputRecording(path)
+        self._closed = False
+        self.quit_on_finish = quit_on_finish
+        self.loop = loop
+        self.frame_index = 0
+        self.frame = InputFrame(0, (0, 0), (0, 0), (0, 0), 0, 0, 0, 0, 0, 0)
+
+        self.on_finish = Event[NoArgEvent]()
+
+        self._game.keyboard.replay = self
+        self._game.mouse.replay = self
+        self._game.on_quit += self.close
+
+    @property
+    def finished(self) -> bool:
+        return self.frame_index >= len(self.recording)
+
+    def seek(self, frame_index: int) -> None:
+        self.frame_index = frame_index
+
+    def update(self) -> None:
+        if self._game.keyboard.replay is not self:
+            return
+
+        if self.finished and self.loop:
+            self.frame_index = 0
+
+        if self.finished:
+            self.close()
+            self.on_finish.invoke()
+
+            if self.quit_on_finish:
+                self._game.quit()
+            return
+
+        self.frame = self.recording[self.frame_index]
+        self.frame_index += 1
+
+        # `Time.post_update` overwrites this at the end of the frame, but this runs first thing in
+        # the next one so everything in between sees the recorded value
+        self._game.time._deltatime = self.frame.deltatime
+
+    def removed(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops replaying, going back to live input, and closes the recording.\n
+        Doesn't raise exception if it was already closed.
+        """
+        if self._game.keyboard.replay is self:
+            self._game.keyboard.replay = None
+            self._game.mouse.replay = None
+            # resets the relative movement accumulated by SDL during the replay, so that it
+            # doesn't leak into the first live frame
+            pygame.mouse.get_rel()
+
+        if not self._closed:
+            self._closed = True
+            self.recording.close()
@@ -2,8 +2,9 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import KW_ONLY, dataclass, field
-from typing import TYPE_CHECKING, Callable, Literal, Optional, Tuple, final
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Tuple, Type, TypeVar, final
 from bisect import insort
+from operator import attrgetter
 
 from pygame import gfxdraw
 from pygame.color import Color
@@ -11,18 +12,68 @@ from pygame.math import Vector2
 from pygame.rect import Rect
 from pygame.surface import Surface
 
-from .utils import vec2_to_int_tuple
+from .caching import frame_cached
 
 if TYPE_CHECKING:
+    from ._systems.camera import Camera
     from .game import Game
 
 
+RenderableSelf = TypeVar('RenderableSelf', bound='Renderable')
+_layer = attrgetter('layer')
+
+
+# shared by the cached `pixel_*` properties and `draw`, which doesn't go through the cache
+def _pixel_pos(camera: 'Camera', pos: Vector2) -> Tuple[int, int]:
+    x, y = camera.world_to_pixel_xy(pos.x, pos.y)
+    return int(x), int(y)
+
+
+def _pixel_length(camera: 'Camera', length: float) -> int:
+    return int(camera.world_to_pixel_scale(length))
+
+
+# renderables are slotted since lots of them get created, and they're all the same shape anyway.
 # this class isn't supposed to be instanced, but mypy apparently thinks it is
-@dataclass  # type: ignore
+@dataclass(slots=True, weakref_slot=True)  # type: ignore
 class Renderable(ABC):
     _game: 'Game'
     _always_render: bool = field(default=False, init=False)
     layer: float = field(default=1, init=False)
+    # whether this renderable came from `acquire` and hasn't been released yet
+    _pooled: bool = field(default=False, init=False, repr=False)
+
+    @classmethod
+    def acquire(cls: Type[RenderableSelf], game: 'Game', *args: Any, **kwargs: Any) -> RenderableSelf:
+        """
+        Same as instancing the class, but reuses a released instance of it if there is one.\n
+        This is meant for renderables that are created every frame just to be `render`ed once:
+        they are released back to the pool automatically after being drawn (unless `always_render`
+        is set by then), so they must not be used after the frame they were acquired in.\n
+        Acquiring isn't faster than instancing (CPython allocates small objects quickly), but it
+        doesn't allocate, so lots of one-shot renderables don't keep triggering garbage collections.
+
+        >>> Circle.acquire(game, pos, 0.5, Color(255, 0, 0)).render()
+        """
+        pool = game.rendering._pools.get(cls)
+
+        if pool:
+            renderable = pool.pop()
+            renderable.__init__(game, *args, **kwargs)  # type: ignore
+        else:
+            renderable = cls(game, *args, **kwargs)
+
+        renderable._pooled = True
+        return renderable
+
+    def release(self) -> None:
+        """
+        Returns an acquired renderable to the pool early, so it won't be drawn.\n
+        Doesn't raise exception if the renderable wasn't acquired or was already released.
+        """
+        if self._pooled:
+            self.cancel_rendering()
+            self._game.rendering._release(self)
 
     @property
     def always_render(self) -> bool:
@@ -52,19 +103,25 @@ class Renderable(ABC):
         # we would be adding this object again and again to the list of renderables, which would
         # lag the game, obviously
         if not self.always_render:
-            insort(self._game.rendering.renderables, self, key=lambda r: r.layer)
+            insort(self._game.rendering.renderables, self, key=_layer)
 
     @final
     def cancel_rendering(self) -> None:
-        if self in self._game.rendering.renderables:
-            self._game.rendering.renderables.remove(self)
+        renderables = self._game.rendering.renderables
+
+        # by identity, since `in` and `remove` would also match any other renderable that's equal
+        # to this one (e.g. a circle with the same position, radius and colors)
+        for i, renderable in enumerate(renderables):
+            if renderable is self:
+                del renderables[i]
+                return
 
     @abstractmethod
     def draw(self) -> None:
         raise NotImplementedError()
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Circle(Renderable):
     pos: Vector2
     radius: float
@@ -74,31 +131,54 @@ class Circle(Renderable):
     antialiasing: bool = True
     stroke_mode: Literal['inside', 'outside'] = 'inside'
     _use_aaellipse_for_aa: bool = field(default=True, init=False)
+    # see `frame_cached`
+    _pixel_pos_cache: Any = field(default=None, init=False, repr=False, compare=False)
+    _pixel_radius_cache: Any = field(default=None, init=False, repr=False, compare=False)
 
-    @property
+    @frame_cached(key=lambda self: (self.pos.x, self.pos.y))
     def pixel_pos(self) -> Tuple[int, int]:
-        return vec2_to_int_tuple(
-            self._game.camera.world_to_pixel_pos(self.pos)
-        )
+        return _pixel_pos(self._game.camera, self.pos)
 
-    @property
+    @frame_cached(key=lambda self: self.radius)
     def pixel_radius(self) -> int:
-        return int(self._game.camera.world_to_pixel_scale(self.radius))
+        return _pixel_length(self._game.camera, self.radius)
 
     def draw(self) -> None:
-        # just so we don't have to keep doing the calculations everytime we cache this stuff
-        pixel_pos = self.pixel_pos
-        pixel_radius = self.pixel_radius
+        # computed here instead of through the cached properties, since drawing reads them once
+        # per frame, and the cache would only add overhead
+        camera = self._game.camera
+        pixel_pos = x, y = _pixel_pos(camera, self.pos)
+        pixel_radius = _pixel_length(camera, self.radius)
+
+        rendering = self._game.rendering
+        surface = self._game.window.surface
+        # strokes drawn outside add a pixel
+        extent = pixel_radius + 1
+
+        if x < -extent or y < -extent or x >= surface.get_width() + extent or y >= surface.get_height() + extent:
+            if self._game.profiler is not None:
+                self._game.profiler.count('culls')
+            return
+
+        if pixel_radius * 2 < rendering.lod_pixel_size:
+            color = self.fill_color if self.fill_color is not None else self.stroke_color
+
+            if color is not None:
+                surface.set_at(pixel_pos, color)
+            return
+
+        antialiasing = self.antialiasing and rendering.antialiasing and pixel_radius * 2 >= rendering.lod_aa_size
+        stroke_color = self.stroke_color if rendering.strokes or self.fill_color is None else None
 
         if self.fill_color is not None:
             gfxdraw.filled_circle(
-                self._game.window.surface,
+                surface,
                 *pixel_pos,
                 pixel_radius,
                 self.fill_color
             )
 
-            if self.antialiasing and self.stroke_color is None:
+            if antialiasing and stroke_color is None:
                 # gfxdraw.filled_circle isn't antialiased, so we do this to apply antialiasing.
                 # we don't have to do this if there's a stroke_color because it's gonna be done
                 # if there is one.
@@ -112,9 +192,9 @@ class Circle(Renderable):
                 # because of this behaviour, this can be switched off using `_use_aaellipse_for_aa`.
                 self._draw_aa(pixel_pos, pixel_radius, self.fill_color)
 
-        if self.stroke_color is not None:
-            if self.antialiasing:
-                self._draw_aa(pixel_pos, pixel_radius, self.stroke_color)
+        if stroke_color is not None:
+            if antialiasing:
+                self._draw_aa(pixel_pos, pixel_radius, stroke_color)
             else:
                 # this uses the same tecnique as the antialiasing thing to draw the border outside
                 # of the circle instead of inside, but we change the drawing methods used so as to
@@ -124,7 +204,7 @@ class Circle(Renderable):
                 self._conditionally_draw_circle_or_ellipse(
                     pixel_pos,
                     pixel_radius,
-                    self.stroke_color,
+                    stroke_color,
                     self.stroke_mode == 'outside',
                     ellipse_func=gfxdraw.ellipse,
                     circle_func=gfxdraw.circle
@@ -133,12 +213,7 @@ class Circle(Renderable):
     def _draw_aa(self, pos: Tuple[int, int], radius: int, color: Color) -> None:
         self._conditionally_draw_circle_or_ellipse(pos, radius, color, self._use_aaellipse_for_aa)
 
-    # the only reason why this method takes position and radius as parameters is because we cache
-    # at the beggining of the draw method, and as since they're local variables they have to be
-    # passed as arguments here.
-    # TODO: perhaps calculating that kinda stuff and caching it on a per-frame basis can solve
-    # this, making so that when we use the property `pixel_pos` or `pixel_radius` more than once
-    # in one frame, we get a cached value.
+    # position and radius are passed as arguments since `draw` already has them in local variables
     def _conditionally_draw_circle_or_ellipse(
         self,
         pos: Tuple[int, int],
@@ -166,7 +241,7 @@ class Circle(Renderable):
             )
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Rectangle(Renderable):
     pos: Vector2
     width: float
@@ -176,27 +251,50 @@ class Rectangle(Renderable):
     _: KW_ONLY
     rect_mode: Literal['center', 'top_right'] = 'center'
     stroke_mode: Literal['inside', 'outside'] = 'inside'
+    # see `frame_cached`
+    _pixel_pos_cache: Any = field(default=None, init=False, repr=False, compare=False)
+    _pixel_size_cache: Any = field(default=None, init=False, repr=False, compare=False)
 
-    @property
+    @frame_cached(key=lambda self: (self.pos.x, self.pos.y))
     def pixel_pos(self) -> Tuple[int, int]:
-        return vec2_to_int_tuple(
-            self._game.camera.world_to_pixel_pos(self.pos)
-        )
+        return _pixel_pos(self._game.camera, self.pos)
 
-    @property
+    @frame_cached(key=lambda self: (self.width, self.height))
     def pixel_size(self) -> Tuple[int, int]:
-        return vec2_to_int_tuple((
-            self._game.camera.world_to_pixel_scale(self.width),
-            self._game.camera.world_to_pixel_scale(self.height)
-        ))
+        camera = self._game.camera
+        return _pixel_length(camera, self.width), _pixel_length(camera, self.height)
 
-    # no reason to cache `pixel_pos` and `pixel_size` here because they're only ever used once
     def draw(self) -> None:
+        # computed here instead of through the cached properties, see `Circle.draw`
+        camera = self._game.camera
+        pixel_pos = _pixel_pos(camera, self.pos)
+        size = _pixel_length(camera, self.width), _pixel_length(camera, self.height)
+
         if self.rect_mode == 'center':
-            rect = Rect(0, 0, *self.pixel_size)
-            rect.center = self.pixel_pos
+            rect = Rect(0, 0, *size)
+            rect.center = pixel_pos
         else:
-            rect = Rect(*self.pixel_pos, *self.pixel_size)
+            rect = Rect(*pixel_pos, *size)
+
+        rendering = self._game.rendering
+        surface = self._game.window.surface
+
+        # strokes drawn outside add a pixel on each side
+        if not rect.inflate(4, 4).colliderect(surface.get_rect()):
+            if self._game.profiler is not None:
+                self._game.profiler.count('culls')
+            return
+
+        if max(rect.width, rect.height) < rendering.lod_pixel_size:
+            color = self.fill_color if self.fill_color is not None else self.stroke_color
+
+            if color is not None:
+                rect.width = max(rect.width, 1)
+                rect.height = max(rect.height, 1)
+                surface.fill(color, rect)
+            return
+
+        stroke_color = self.stroke_color if rendering.strokes or self.fill_color is None else None
 
         if self.fill_color is not None:
             points = [
@@ -207,12 +305,12 @@ class Rectangle(Renderable):
             ]
 
             gfxdraw.filled_polygon(
-                self._game.window.surface,
+                surface,
                 points,
                 self.fill_color
             )
 
-        if self.stroke_color is not None:
+        if stroke_color is not None:
             if self.stroke_mode == 'inside':
                 rect.width += 1
                 rect.height += 1
@@ -223,7 +321,7 @@ class Rectangle(Renderable):
                 rect.height += 3
 
             gfxdraw.rectangle(
-                self._game.window.surface,
+                surface,
                 rect,
-                self.stroke_color
+                stroke_color
             )
@@ -0,0 +1,268 @@
+from collections import OrderedDict
+from dataclasses import KW_ONLY, dataclass, field, fields
+from math import ceil, floor
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from pygame.color import Color
+from pygame.math import Vector2
+from pygame.surface import Surface
+
+from .renderables import Renderable
+from .viewports import Viewport
+
+
+# (chunk column, chunk row, chunk size in pixels)
+_ChunkKey = tuple[int, int, int]
+TileIndex = int | slice
+
+
+# eq=False since comparing tile arrays would be both slow and ambiguous
+@dataclass(slots=True, eq=False)
+class Tilemap(Renderable):
+    """
+    A grid of tiles, drawn as solid colors from a palette.\n
+    Tile ids are stored in a 2D NumPy array (`tiles[row, col]`, rows going down from `pos`, the
+    top left corner of the map). The map is split in chunks of `chunk_size` tiles, which are
+    rasterized into cached surfaces, so drawing only blits the chunks that are on screen.\n
+    Chunks are cached per size in pixels (i.e. per zoom level) in an LRU cache of `cache_size`
+    surfaces. At most `rebuild_budget` chunks are rasterized per frame: after zooming, chunks that
+    are over budget are drawn by scaling a surface cached for another zoom level until they're
+    rebuilt.
+
+    >>> tilemap = Tilemap(game, np.zeros((1000, 1000), np.int32), [Color('green'), Color('blue')], Vector2(-500, 500))
+    >>> tilemap[10:20, 10] = 1  # only marks the affected chunks dirty
+    >>> tilemap.always_render = True
+    """
+    tiles: NDArray[np.integer[Any]]
+    palette: Sequence[Color] | NDArray[np.uint8]
+    pos: Vector2
+    tile_size: float = 1
+    _: KW_ONLY
+    chunk_size: int = 32
+    cache_size: int = 256
+    rebuild_budget: int = 8
+    # tiles with this id aren't drawn
+    empty_id: Optional[int] = None
+
+    _colors: NDArray[np.uint8] = field(init=False, repr=False)
+    # how many times each chunk was edited, so that cached surfaces of older versions are rebuilt
+    _versions: NDArray[np.int64] = field(init=False, repr=False)
+    _cache: 'OrderedDict[_ChunkKey, tuple[int, Surface]]' = field(init=False, repr=False)
+    # the chunk sizes each chunk is cached at, for drawing something while it isn't rebuilt
+    _cached_sizes: dict[tuple[int, int], set[int]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        rows, cols = self.tiles.shape
+
+        self._colors = _palette_array(self.palette)
+        self._versions = np.zeros((ceil(rows / self.chunk_size), ceil(cols / self.chunk_size)), dtype=np.int64)
+        self._cache = OrderedDict()
+        self._cached_sizes = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # cached chunks are surfaces, which can't be pickled (e.g. by `Game.save_snapshot`). they're
+        # rasterized again as the map is drawn.
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        del state['_cache'], state['_cached_sizes']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+        self._cache = OrderedDict()
+        self._cached_sizes = {}
+
+    def __setitem__(self, index: tuple[TileIndex, TileIndex], value: Any) -> None:
+        """
+        Sets tiles like `tiles[row, col] = value` does, marking only the chunks that contain them
+        as dirty. Edit `tiles` directly and call `mark_dirty` for anything fancier.
+        """
+        self.tiles[index] = value
+
+        rows, cols = self.tiles.shape
+        row_start, row_stop = _bounds(index[0], rows)
+        col_start, col_stop = _bounds(index[1], cols)
+
+        self.mark_dirty(row_start, col_start, row_stop, col_stop)
+
+    def mark_dirty(self, row_start: int, col_start: int, row_stop: int, col_stop: int) -> None:
+        """
+        Marks the chunks containing the tiles in `[row_start, row_stop)` x `[col_start, col_stop)`
+        as dirty, so they're rasterized again.
+        """
+        if row_stop <= row_start or col_stop <= col_start:
+            return
+
+        size = self.chunk_size
+        self._versions[row_start // size:(row_stop - 1) // size + 1, col_start // size:(col_stop - 1) // size + 1] += 1
+
+    def invalidate(self) -> None:
+        """
+        Drops every cached chunk, e.g. after changing `palette` or replacing `tiles`.
+        """
+        self.__post_init__()
+
+    def draw(self) -> None:
+        camera = self._game.camera
+        surface = self._game.window.surface
+        width, height = surface.get_size()
+
+        # the camera is an affine transform, so the scale is recovered from two converted points
+        origin_x, origin_y = camera.world_to_pixel_xy(self.pos.x, self.pos.y)
+        tile_pixels = camera.world_to_pixel_xy(self.pos.x + self.tile_size, self.pos.y)[0] - origin_x
+
+        if tile_pixels <= 0:
+            return
+
+        chunk_pixels = tile_pixels * self.chunk_size
+        # chunks are rasterized at a whole amount of pixels, rounded up so that neighbours overlap
+        # by a pixel at most instead of leaving gaps
+        zoom = ceil(chunk_pixels)
+
+        chunk_rows, chunk_cols = self._versions.shape
+
+        first_col = max(0, floor(-origin_x / chunk_pixels))
+        last_col = min(chunk_cols - 1, floor((width - origin_x) / chunk_pixels))
+        first_row = max(0, floor(-origin_y / chunk_pixels))
+        last_row = min(chunk_rows - 1, floor((height - origin_y) / chunk_pixels))
+
+        budget = self.rebuild_budget
+        built = 0
+        culled = chunk_rows * chunk_cols
+
+        for row in range(first_row, last_row + 1):
+            y = floor(origin_y + row * chunk_pixels)
+
+            for col in range(first_col, last_col + 1):
+                x = floor(origin_x + col * chunk_pixels)
+                culled -= 1
+
+                chunk = self._get_chunk(col, row, zoom, tile_pixels, rebuild=built < budget)
+
+                if chunk is None:
+                    continue
+
+                if chunk[1]:
+                    built += 1
+
+                surface.blit(chunk[0], (x, y))
+
+        if self._game.profiler is not None:
+            self._game.profiler.count('culls', culled)
+            self._game.profiler.count('chunk_builds', built)
+
+    def _get_chunk(self, col: int, row: int, zoom: int, tile_pixels: float, rebuild: bool) -> Optional[tuple[Surface, bool]]:
+        """
+        Returns the surface of a chunk at a zoom level, and whether it had to be rasterized.
+        """
+        key = (col, row, zoom)
+        version = int(self._versions[row, col])
+        cached = self._cache.get(key)
+
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(key)
+            return cached[1], False
+
+        if rebuild:
+            chunk = self._rasterize(col, row, tile_pixels)
+            self._store(key, version, chunk)
+            return chunk, True
+
+        # over budget: an outdated version, or the chunk at another zoom level, is better than a hole
+        if cached is not None:
+            return cached[1], False
+
+        sizes = self._cached_sizes.get((col, row))
+
+        if not sizes:
+            return None
+
+        nearest = min(sizes, key=lambda size: abs(size - zoom))
+        other = self._cache[(col, row, nearest)][1]
+        scale = zoom / nearest
+
+        return pygame.transform.scale(other, (ceil(other.get_width() * scale), ceil(other.get_height() * scale))), False
+
+    def _rasterize(self, col: int, row: int, tile_pixels: float) -> Surface:
+        size = self.chunk_size
+        ids = self.tiles[row * size:(row + 1) * size, col * size:(col + 1) * size]
+
+        rows, cols = ids.shape
+        return pygame.transform.scale(self._image(ids), (ceil(cols * tile_pixels), ceil(rows * tile_pixels)))
+
+    def _image(self, ids: NDArray[np.integer[Any]]) -> Surface:
+        """
+        Returns a surface with one pixel per tile, which is then scaled up with nearest neighbour
+        filtering.
+        """
+        colors = self._colors[np.clip(ids, 0, len(self._colors) - 1)].swapaxes(0, 1)
+
+        if self.empty_id is None:
+            return pygame.surfarray.make_surface(colors)
+
+        image = Surface(colors.shape[:2], pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(image)[...] = colors
+        pygame.surfarray.pixels_alpha(image)[...] = np.where(ids.T == self.empty_id, 0, 255)
+
+        return image
+
+    def _store(self, key: _ChunkKey, version: int, chunk: Surface) -> None:
+        self._cache[key] = (version, chunk)
+        self._cache.move_to_end(key)
+        self._cached_sizes.setdefault(key[:2], set()).add(key[2])
+
+        while len(self._cache) > self.cache_size:
+            (col, row, zoom), _ = self._cache.popitem(last=False)
+            self._cached_sizes[(col, row)].discard(zoom)
+
+
+def _draw_simplified(viewport: Viewport, tilemap: Tilemap, surface: Surface) -> None:
+    origin_x, origin_y = viewport.world_to_pixel_xy(tilemap.pos.x, tilemap.pos.y)
+    tile_pixels = tilemap.tile_size * viewport.scale
+    rows, cols = tilemap.tiles.shape
+    width, height = surface.get_size()
+
+    first_col = max(0, floor(-origin_x / tile_pixels))
+    last_col = min(cols, ceil((width - origin_x) / tile_pixels))
+    first_row = max(0, floor(-origin_y / tile_pixels))
+    last_row = min(rows, ceil((height - origin_y) / tile_pixels))
+
+    if first_col >= last_col or first_row >= last_row:
+        return
+
+    # viewports are usually zoomed out, so tiles are sampled to roughly one per pixel, without caching
+    step = max(1, floor(1 / tile_pixels))
+    ids = tilemap.tiles[first_row:last_row:step, first_col:last_col:step]
+    size = (ceil(ids.shape[1] * step * tile_pixels), ceil(ids.shape[0] * step * tile_pixels))
+
+    surface.blit(
+        pygame.transform.scale(tilemap._image(ids), size),
+        (floor(origin_x + first_col * tile_pixels), floor(origin_y + first_row * tile_pixels))
+    )
+
+
+Viewport.register_draw(Tilemap, _draw_simplified)
+
+
+def _palette_array(palette: Sequence[Color] | NDArray[np.uint8]) -> NDArray[np.uint8]:
+    if isinstance(palette, np.ndarray):
+        return palette[:, :3].astype(np.uint8)
+
+    return np.array([tuple(Color(color))[:3] for color in palette], dtype=np.uint8)
+
+
+def _bounds(index: TileIndex, length: int) -> tuple[int, int]:
+    if isinstance(index, slice):
+        start, stop, step = index.indices(length)
+
+        if step < 0:
+            start, stop = stop + 1, start + 1
+
+        return start, stop
+
+    index = index + length if index < 0 else index
+    return index, index + 1
@@ -0,0 +1,333 @@
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+from pygame.color import Color
+from pygame.math import Vector2, Vector3
+
+from .core import System
+from .event import Event
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+class Easing(IntEnum):
+    linear = 0
+    in_quad = 1
+    out_quad = 2
+    in_out_quad = 3
+    in_cubic = 4
+    out_cubic = 5
+    in_out_cubic = 6
+    in_sine = 7
+    out_sine = 8
+    in_out_sine = 9
+    out_back = 10
+
+
+# vectorized easing functions, indexed by `Easing`. they map progress in [0, 1] to [0, 1] (mostly).
+EASINGS: list[Callable[[NDArray[np.float64]], NDArray[np.float64]]] = [
+    lambda t: t,
+    lambda t: t * t,
+    lambda t: 1 - (1 - t) ** 2,
+    lambda t: np.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2),
+    lambda t: t ** 3,
+    lambda t: 1 - (1 - t) ** 3,
+    lambda t: np.where(t < 0.5, 4 * t ** 3, 1 - (-2 * t + 2) ** 3 / 2),
+    lambda t: 1 - np.cos(t * np.pi / 2),
+    lambda t: np.sin(t * np.pi / 2),
+    lambda t: (1 - np.cos(t * np.pi)) / 2,
+    lambda t: 1 + 2.70158 * (t - 1) ** 3 + 1.70158 * (t - 1) ** 2,
+]
+
+TweenCompleteEvent = Callable[['Tween'], None]
+Tweenable = float | Vector2 | Vector3 | Color
+
+# the id of rows whose tween was cancelled or finished, until they're compacted away
+_DEAD = -1
+
+
+@dataclass(eq=False)
+class Tween:
+    """
+    A handle to a running tween, returned by `Tweens.to`.
+    """
+    _tweens: 'Tweens' = field(repr=False)
+    id: int
+    target: Any
+    attr: str
+    done: bool = False
+    cancelled: bool = False
+
+    def cancel(self) -> None:
+        """
+        Stops the tween where it is. Doesn't raise exception if it already finished.
+        """
+        self._tweens.cancel(self)
+
+
+class Tweens(System):
+    """
+    Animates numeric properties, such as a circle's `radius`, `pos` or `fill_color`, without a
+    coroutine per animation.\n
+    Every tween is a row (one per component, for vectors and colors) in NumPy arrays of start and
+    end values, start times, durations and easings, which are all evaluated in a single vectorized
+    pass per frame and then written back to their targets. Times are in seconds of
+    `Time.deltatime`, so tweens follow `Time.fixed_deltatime` and recordings.\n
+    Tweens are evaluated after every component's update and before rendering.
+
+    >>> tweens = Tweens(game)
+    >>> tweens.to(circle, 'radius', 2, 0.5, Easing.out_cubic)
+    >>> tweens.to(circle, 'fill_color', Color('red'), 1).cancel()
+    >>> tweens.on_complete += lambda tween: print(tween.target, 'arrived')
+    """
+
+    requires = ('time',)
+    before = ('rendering',)
+
+    def __init__(self, game: 'Game', capacity: int = 256) -> None:
+        super().__init__(game)
+
+        self._now = 0.0
+        self._size = 0
+        self._next_id = 0
+
+        self._start = np.zeros(capacity)
+        self._end = np.zeros(capacity)
+        self._t0 = np.zeros(capacity)
+        self._duration = np.zeros(capacity)
+        self._easing = np.zeros(capacity, dtype=np.uint8)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        # where each row is written to: (target, attribute, component index or -1, whether it takes ints)
+        self._targets: list[tuple[Any, str, int, bool]] = []
+
+        self._tweens: dict[int, Tween] = {}
+        # where each tween's rows are, as (first row, row count), so cancelling doesn't search for them
+        self._rows: dict[int, tuple[int, int]] = {}
+        # how many rows are `_DEAD`. cancelling only marks rows as dead, and they're all removed at
+        # once during the next `post_update`, instead of compacting the columns on every cancel.
+        self._dead = 0
+        # the running tween of each (target, attribute), which new tweens of it replace
+        self._by_property: dict[tuple[int, str], Tween] = {}
+
+        self.on_complete = Event[TweenCompleteEvent]()
+
+    @property
+    def count(self) -> int:
+        """
+        How many tweens are running (or waiting for their delay).
+        """
+        return len(self._tweens)
+
+    def to(
+        self,
+        target: Any,
+        attr: str,
+        end: Tweenable | Sequence[float],
+        duration: float,
+        easing: Easing = Easing.linear, *,
+        start: Optional[Tweenable | Sequence[float]] = None,
+        delay: float = 0
+    ) -> Tween:
+        """
+        Starts animating an attribute of an object from its current value (or `start`) to `end`.\n
+        A running tween of the same attribute of the same object is cancelled.
+
+        Parameters
+        ----------
+        target : `Any`
+            The object whose attribute is animated, e.g. a `Circle`.
+        attr : `str`
+            The attribute's name. Its value must be a number, or a mutable sequence of numbers
+            such as `Vector2` or `Color`, which are changed in place.
+        end : `Tweenable | Sequence[float]`
+            The value the attribute ends up with.
+        duration : `float`
+            How long the animation takes, in seconds.
+        easing : `Easing, optional`
+            Linear by default.
+        start : `Optional[Tweenable | Sequence[float]], optional`
+            The value the attribute starts from, its current value by default.
+        delay : `float, optional`
+            How long to wait before starting, in seconds. The attribute isn't changed until then.
+
+        Returns
+        -------
+        `Tween`
+            A handle to the tween, which can be used to cancel it.
+        """
+        key = (id(target), attr)
+
+        if key in self._by_property:
+            self.cancel(self._by_property[key])
+
+        current = getattr(target, attr)
+        scalar = isinstance(current, (int, float))
+        starts = [current if start is None else start] if scalar else list(current if start is None else start)  # type: ignore
+        ends = [end] if scalar else list(end)  # type: ignore
+
+        if len(starts) != len(ends):
+            raise ValueError(f'Can\'t tween "{attr}" from {len(starts)} to {len(ends)} components!')
+
+        # colors only take ints
+        integer = isinstance(current, Color)
+
+        tween = Tween(self, self._next_id, target, attr)
+        self._next_id += 1
+
+        rows = len(starts)
+        self._reserve(rows)
+        span = slice(self._size, self._size + rows)
+
+        self._start[span] = starts
+        self._end[span] = ends
+        self._t0[span] = self._now + delay
+        self._duration[span] = duration
+        self._easing[span] = easing
+        self._ids[span] = tween.id
+        self._targets.extend((target, attr, -1 if scalar else i, integer) for i in range(rows))
+
+        self._rows[tween.id] = (self._size, rows)
+        self._size += rows
+        self._tweens[tween.id] = tween
+        self._by_property[key] = tween
+
+        return tween
+
+    def cancel(self, tween: Tween) -> None:
+        """
+        Stops a tween where it is. Doesn't raise exception if it already finished.
+        """
+        if tween.id not in self._tweens:
+            return
+
+        tween.cancelled = True
+        self._kill(tween)
+
+    def cancel_all(self, target: Any = None) -> None:
+        """
+        Stops every tween, or only those of `target`.
+        """
+        tweens = [
+            tween
+            for tween in self._tweens.values()
+            if target is None or tween.target is target
+        ]
+
+        for tween in tweens:
+            tween.cancelled = True
+            self._kill(tween)
+
+    def post_update(self) -> None:
+        self._now += self._game.time.deltatime
+
+        if self._dead:
+            self._compact()
+
+        size = self._size
+
+        if not size:
+            return
+
+        now = self._now
+        duration = self._duration[:size]
+        elapsed = now - self._t0[:size]
+
+        # zero durations jump straight to the end
+        progress = np.clip(np.divide(elapsed, duration, out=np.ones(size), where=duration > 0), 0, 1)
+        eased = np.empty(size)
+        easings = self._easing[:size]
+
+        for easing in np.unique(easings).tolist():
+            rows = easings == easing
+            eased[rows] = EASINGS[easing](progress[rows])
+
+        start = self._start[:size]
+        values = start + (self._end[:size] - start) * eased
+
+        started = np.flatnonzero(elapsed >= 0)
+        targets = self._targets
+
+        for row, value in zip(started.tolist(), values[started].tolist()):
+            target, attr, index, integer = targets[row]
+
+            if integer:
+                value = round(value)
+
+            if index < 0:
+                setattr(target, attr, value)
+            else:
+                getattr(target, attr)[index] = value
+
+        finished = (progress >= 1) & (elapsed >= 0)
+
+        if not finished.any():
+            return
+
+        completed = [self._tweens[i] for i in np.unique(self._ids[:size][finished]).tolist()]
+
+        for tween in completed:
+            tween.done = True
+            self._kill(tween)
+
+        for tween in completed:
+            self.on_complete.invoke(tween)
+
+    def _kill(self, tween: Tween) -> None:
+        """
+        Marks a tween's rows as dead, so they're no longer evaluated, and forgets the tween.
+        """
+        first, rows = self._rows.pop(tween.id)
+        self._ids[first:first + rows] = _DEAD
+        self._dead += rows
+
+        del self._tweens[tween.id]
+        key = (id(tween.target), tween.attr)
+
+        if self._by_property.get(key) is tween:
+            del self._by_property[key]
+
+    def _compact(self) -> None:
+        """
+        Removes the dead rows, keeping the others in order.
+        """
+        size = self._size
+        keep = self._ids[:size] != _DEAD
+        kept = size - self._dead
+
+        for column in (self._start, self._end, self._t0, self._duration, self._easing, self._ids):
+            column[:kept] = column[:size][keep]
+
+        self._targets = [row for row, k in zip(self._targets, keep.tolist()) if k]
+
+        # rows only move back by the number of dead rows before them, and a tween's rows stay together
+        moved = (np.cumsum(keep) - 1).tolist()
+        self._rows = {tween_id: (moved[first], rows) for tween_id, (first, rows) in self._rows.items()}
+
+        self._size = kept
+        self._dead = 0
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._size + rows
+        capacity = len(self._ids)
+
+        if needed <= capacity:
+            return
+
+        if self._dead and needed - self._dead <= capacity:
+            self._compact()
+            return
+
+        capacity = max(capacity, 1)
+
+        while capacity < needed:
+            capacity *= 2
+
+        for name in ('_start', '_end', '_t0', '_duration', '_easing', '_ids'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
@@ -4,6 +4,11 @@ from typing import Any, Iterable, Iterator, Optional, Tuple, TypeVar
 from pygame.color import Color
 from pygame.math import Vector2
 
+__all__ = [
+    'get_by_attrs', 'filter_by_attrs', 'ilen', 'clamp', 'remap', 'vec2_to_int_tuple',
+    'normalize_vec2_if_possible', 'random_color', 'percentile', 'summarize'
+]
+
 T = TypeVar('T')
 
 
@@ -121,3 +126,46 @@ def random_color(randomize_alpha: bool=False) -> Color:
         color.a = randint(0, 255)
 
     return color
+
+
+def percentile(samples: Iterable[float], q: float) -> float:
+    """
+    Returns the `q`th percentile (0-100) of some samples, using the nearest rank.
+
+    Parameters
+    ----------
+    samples : `Iterable[float]`
+        The samples, in any order.
+    q : `float`
+        The percentile, e.g. `95`.
+
+    Returns
+    -------
+    `float`
+        The percentile, or `0` if there are no samples.
+    """
+    ordered = sorted(samples)
+    return _at(ordered, q) if ordered else 0
+
+
+def summarize(samples: Iterable[float], scale: float = 1) -> dict[str, float]:
+    """
+    Returns the mean, p50, p95, p99 and max of some samples, each multiplied by `scale` (e.g. to
+    convert seconds to milliseconds), or an empty dict if there are no samples.
+    """
+    ordered = sorted(samples)
+
+    if not ordered:
+        return {}
+
+    return {
+        'mean': sum(ordered) / len(ordered) * scale,
+        'p50': _at(ordered, 50) * scale,
+        'p95': _at(ordered, 95) * scale,
+        'p99': _at(ordered, 99) * scale,
+        'max': ordered[-1] * scale
+    }
+
+
+def _at(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
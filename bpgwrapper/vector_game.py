@@ -0,0 +1,444 @@
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Protocol
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from .game import Game
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+class Environment(Protocol):
+    """
+    What `VectorGame` runs in each of its games. It's created by the environment factory passed to
+    `VectorGame`, which receives the game and the environment's index.
+    """
+
+    def reset(self) -> None:
+        """
+        Starts a new episode, e.g. by moving everything back to where it starts.
+        """
+
+    def act(self, action: NDArray[Any]) -> None:
+        """
+        Applies an action, before the game is stepped.
+        """
+
+    def observe(self, observation: NDArray[Any]) -> None:
+        """
+        Writes the current observation into `observation`, which is a view of the shared buffer.
+        """
+
+    def reward(self) -> float:
+        """
+        The reward for the last step.
+        """
+
+    def done(self) -> bool:
+        """
+        Whether the episode has ended.
+        """
+
+
+EnvironmentFactory = Callable[[Game, int], Environment]
+
+# (offset, shape, dtype) of each shared buffer
+_Layout = dict[str, tuple[int, tuple[int, ...], str]]
+
+_ALIGNMENT = 64
+
+# commands sent to the workers, and their replies. these are raw bytes, not pickled objects.
+_RESET = b'r'
+_STEP = b's'
+_CLOSE = b'c'
+_OK = b'k'
+_ERROR = b'e'
+
+
+class VectorGame:
+    """
+    Runs several headless games in worker processes and steps them in lockstep, for e.g. training
+    populations of agents.\n
+    Observations, actions, rewards and episode ends are exchanged through NumPy arrays backed by
+    shared memory, so stepping only sends a single byte to each worker. The arrays returned by
+    `reset` and `step` are those buffers (not copies) and are overwritten by the next step.\n
+    The environment factory must be picklable (e.g. a module level function or class), and since
+    workers are spawned, the script creating a `VectorGame` needs an `if __name__ == '__main__'`
+    guard.
+
+    >>> with VectorGame(Rocket, 64, observation_shape=(6,), action_shape=(2,)) as game:
+    ...     observations = game.reset()
+    ...     for _ in range(1000):
+    ...         observations, rewards, dones = game.step(policy(observations))
+
+    Parameters
+    ----------
+    env_factory : `EnvironmentFactory`
+        Creates the `Environment` of each game, given the game and the environment's index.
+    count : `int`
+        How many games to run.
+    observation_shape : `tuple[int, ...]`
+        The shape of a single environment's observation.
+    action_shape : `tuple[int, ...]`
+        The shape of a single environment's action.
+    observation_dtype : `DTypeLike, optional`
+        `float32` by default.
+    action_dtype : `DTypeLike, optional`
+        `float32` by default.
+    systems : `Iterable[str], optional`
+        The systems of each headless game, see `Game`.
+    workers : `Optional[int], optional`
+        How many processes to spread the games over. One per CPU by default.
+    frames_per_step : `int, optional`
+        How many frames each game runs per `step`.
+    deltatime : `float, optional`
+        The fixed deltatime of every game, see `Time.fixed_deltatime`.
+    auto_reset : `bool, optional`
+        Whether environments whose episode ended are reset right away. Their last observation is
+        kept in `terminal_observations`.
+    render_index : `Optional[int], optional`
+        The index of an environment to run in this process instead, with a full game and a real
+        window, for monitoring. It's stepped while the workers step the others.
+    """
+
+    def __init__(
+        self,
+        env_factory: EnvironmentFactory,
+        count: int, *,
+        observation_shape: tuple[int, ...],
+        action_shape: tuple[int, ...],
+        observation_dtype: DTypeLike = np.float32,
+        action_dtype: DTypeLike = np.float32,
+        systems: Iterable[str] = ('time', 'scheduling', 'collision'),
+        workers: Optional[int] = None,
+        frames_per_step: int = 1,
+        deltatime: float = 1 / 60,
+        auto_reset: bool = True,
+        render_index: Optional[int] = None
+    ) -> None:
+        self.count = count
+        self.auto_reset = auto_reset
+
+        layout, size = _layout(count, observation_shape, observation_dtype, action_shape, action_dtype)
+
+        self._memory = SharedMemory(create=True, size=size)
+        self._buffers = _views(self._memory, layout)
+        self._closed = False
+
+        self._local: Optional[_Runner] = None
+
+        if render_index is not None:
+            self._local = _Runner(Game, env_factory, [render_index], self._buffers, frames_per_step, deltatime, auto_reset)
+
+        remote = [i for i in range(count) if i != render_index]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(remote)))
+
+        context = mp.get_context('spawn')
+        self._connections: list[Connection] = []
+        self._processes: list[Any] = []
+
+        for indices in np.array_split(np.array(remote, dtype=np.int64), workers):
+            if not len(indices):
+                continue
+
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_work,
+                args=(
+                    child, self._memory.name, layout, env_factory, indices.tolist(), tuple(systems),
+                    frames_per_step, deltatime, auto_reset
+                ),
+                daemon=True
+            )
+            process.start()
+            child.close()
+
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        # every worker replies once its games are set up
+        self._wait()
+
+    @property
+    def observations(self) -> NDArray[Any]:
+        return self._buffers['observations']
+
+    @property
+    def terminal_observations(self) -> NDArray[Any]:
+        """
+        The last observation of the environments whose episode ended in the last step, before they
+        were reset. Only meaningful where `dones` is `True`, and when `auto_reset` is on.
+        """
+        return self._buffers['terminal_observations']
+
+    @property
+    def actions(self) -> NDArray[Any]:
+        """
+        The actions that `step` applies. Writing to it directly and calling `step` without
+        arguments avoids copying them.
+        """
+        return self._buffers['actions']
+
+    @property
+    def rewards(self) -> NDArray[np.float32]:
+        return self._buffers['rewards']
+
+    @property
+    def dones(self) -> NDArray[np.bool_]:
+        return self._buffers['dones']
+
+    def reset(self) -> NDArray[Any]:
+        """
+        Resets every environment.
+
+        Returns
+        -------
+        `NDArray[Any]`
+            The observations, with shape `(count, *observation_shape)`.
+        """
+        self._run(_RESET)
+        return self.observations
+
+    def step(self, actions: Optional[NDArray[Any]] = None) -> tuple[NDArray[Any], NDArray[np.float32], NDArray[np.bool_]]:
+        """
+        Applies an action to every environment and steps all of the games.
+
+        Parameters
+        ----------
+        actions : `Optional[NDArray[Any]], optional`
+            The actions, with shape `(count, *action_shape)`. If `None`, whatever is in `actions`
+            is used.
+
+        Returns
+        -------
+        `tuple[NDArray[Any], NDArray[np.float32], NDArray[np.bool_]]`
+            The observations, rewards and whether each environment's episode ended.
+        """
+        if actions is not None:
+            self.actions[...] = actions
+
+        self._run(_STEP)
+        return self.observations, self.rewards, self.dones
+
+    def close(self) -> None:
+        """
+        Stops the workers and frees the shared memory. Doesn't raise exception if already closed.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+
+        for connection in self._connections:
+            try:
+                connection.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout=5)
+
+            if process.is_alive():
+                process.terminate()
+
+        for connection in self._connections:
+            connection.close()
+
+        self._connections.clear()
+        self._processes.clear()
+
+        # the views (which the local runner shares) have to be gone before the memory can be closed
+        self._buffers.clear()
+        self._local = None
+
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> 'VectorGame':
+        return self
+
+    def __exit__(
+        self,
+        type: Optional[type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional['TracebackType']
+    ) -> None:
+        self.close()
+
+    def _run(self, command: bytes) -> None:
+        for connection in self._connections:
+            connection.send_bytes(command)
+
+        # the local game runs while the workers are busy with theirs
+        if self._local is not None:
+            if command == _RESET:
+                self._local.reset()
+            else:
+                self._local.step()
+
+        self._wait()
+
+    def _wait(self) -> None:
+        for connection in self._connections:
+            try:
+                reply = connection.recv_bytes()
+            except EOFError:
+                self.close()
+                raise RuntimeError('An environment worker exited unexpectedly!') from None
+
+            if reply[:1] == _ERROR:
+                self.close()
+                raise RuntimeError(f'An environment worker failed:\n{reply[1:].decode()}')
+
+
+class _Runner:
+    """
+    Steps some of the environments of a `VectorGame`, either in a worker or in the main process.
+    """
+
+    def __init__(
+        self,
+        make_game: Callable[[], Game],
+        env_factory: EnvironmentFactory,
+        indices: list[int],
+        buffers: dict[str, NDArray[Any]],
+        frames_per_step: int,
+        deltatime: float,
+        auto_reset: bool
+    ) -> None:
+        self.buffers = buffers
+        self.frames_per_step = frames_per_step
+        self.auto_reset = auto_reset
+
+        self.envs: list[tuple[int, Game, Environment]] = []
+
+        for index in indices:
+            game = make_game()
+
+            if hasattr(game, 'time'):
+                game.time.fixed_deltatime = deltatime
+                # lockstep is as fast as the slowest game, there's no point in limiting the others
+                game.time.target_framerate = None
+
+            game.on_start.invoke()
+            self.envs.append((index, game, env_factory(game, index)))
+
+    def reset(self) -> None:
+        observations = self.buffers['observations']
+
+        for index, _, env in self.envs:
+            env.reset()
+            env.observe(observations[index])
+
+    def step(self) -> None:
+        observations = self.buffers['observations']
+        terminal_observations = self.buffers['terminal_observations']
+        actions = self.buffers['actions']
+        rewards = self.buffers['rewards']
+        dones = self.buffers['dones']
+
+        for index, game, env in self.envs:
+            env.act(actions[index])
+
+            for _ in range(self.frames_per_step):
+                game.step()
+
+            rewards[index] = env.reward()
+            dones[index] = done = env.done()
+            env.observe(observations[index])
+
+            if done and self.auto_reset:
+                terminal_observations[index] = observations[index]
+                env.reset()
+                env.observe(observations[index])
+
+
+def _work(
+    connection: Connection,
+    memory_name: str,
+    layout: _Layout,
+    env_factory: EnvironmentFactory,
+    indices: list[int],
+    systems: tuple[str, ...],
+    frames_per_step: int,
+    deltatime: float,
+    auto_reset: bool
+) -> None:
+    # workers never show anything, even if their systems include a window
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    # the shared memory is owned (and unlinked) by the main process
+    memory = SharedMemory(name=memory_name)
+    buffers = _views(memory, layout)
+
+    try:
+        runner = _Runner(lambda: Game(systems=systems), env_factory, indices, buffers, frames_per_step, deltatime, auto_reset)
+    except Exception:
+        connection.send_bytes(_ERROR + traceback.format_exc().encode())
+        return
+
+    connection.send_bytes(_OK)
+
+    while True:
+        try:
+            command = connection.recv_bytes()
+        except EOFError:
+            break
+
+        if command == _CLOSE:
+            break
+
+        try:
+            if command == _RESET:
+                runner.reset()
+            else:
+                runner.step()
+        except Exception:
+            connection.send_bytes(_ERROR + traceback.format_exc().encode())
+            break
+
+        connection.send_bytes(_OK)
+
+    buffers.clear()
+    del runner
+    memory.close()
+
+
+def _layout(
+    count: int,
+    observation_shape: tuple[int, ...],
+    observation_dtype: DTypeLike,
+    action_shape: tuple[int, ...],
+    action_dtype: DTypeLike
+) -> tuple[_Layout, int]:
+    buffers = {
+        'observations': ((count, *observation_shape), np.dtype(observation_dtype)),
+        'terminal_observations': ((count, *observation_shape), np.dtype(observation_dtype)),
+        'actions': ((count, *action_shape), np.dtype(action_dtype)),
+        'rewards': ((count,), np.dtype(np.float32)),
+        'dones': ((count,), np.dtype(np.bool_)),
+    }
+
+    layout: _Layout = {}
+    offset = 0
+
+    for name, (shape, dtype) in buffers.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = (offset, shape, dtype.str)
+        offset += int(np.prod(shape)) * dtype.itemsize
+
+    return layout, max(offset, 1)
+
+
+def _views(memory: SharedMemory, layout: _Layout) -> dict[str, NDArray[Any]]:
+    return {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf, offset=offset)
+        for name, (offset, shape, dtype) in layout.items()
+    }
@@ -0,0 +1,252 @@
+from dataclasses import KW_ONLY, dataclass, field, fields
+from time import perf_counter
+from typing import Any, Callable, ClassVar, Optional, Tuple, Type, TypeVar
+
+import pygame
+from pygame.color import Color
+from pygame.math import Vector2
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from .renderables import Circle, Rectangle, Renderable
+
+
+RenderableT = TypeVar('RenderableT', bound=Renderable)
+# sizes (e.g. radii) are drawn at half the scale of positions on the window (see `Camera`), so
+# viewports do the same for shapes to look alike in both
+_SIZE_SCALE = 0.5
+# draws a renderable into a viewport's surface, see `Viewport.register_draw`
+SimplifiedDraw = Callable[['Viewport', RenderableT, Surface], None]
+
+
+@dataclass(slots=True, eq=False)
+class Viewport(Renderable):
+    """
+    A secondary view of the world, such as a minimap, with its own camera (`center` and
+    `world_width`), resolution and update rate.\n
+    The renderables of the frame are drawn into an off-screen surface of `size` pixels, which is
+    then blitted at `pos` on the window. Instead of drawing renderables at full cost, viewports use
+    a simplified draw for each type (e.g. a single pixel for tiny circles, no antialiasing) and
+    cull whatever is outside their view. Between updates the last image is reused, so a viewport
+    updating at 10 Hz costs a blit on most frames.\n
+    Viewports draw the renderables that were rendered before them, so they should be on a layer
+    above the rest of the world.
+
+    >>> minimap = Viewport(game, Vector2(10, 10), game.window.size / 4, Vector2(0, 0), 100)
+    >>> minimap.layer = 100
+    >>> minimap.always_render = True
+
+    Parameters
+    ----------
+    pos : `Vector2`
+        The position of the viewport's top left corner on the window, in pixels.
+    size : `Vector2`
+        The resolution of the viewport, in pixels.
+    center : `Vector2`
+        The position of the world at the center of the viewport.
+    world_width : `float`
+        How many world units fit across the viewport.
+    update_rate : `Optional[float], optional`
+        How many times per second the image is drawn again, or `None` for every frame.
+    background : `Optional[Color], optional`
+        The color the image is cleared with before drawing, or `None` for a transparent one.
+    border_color : `Optional[Color], optional`
+        The color of a border drawn around the viewport, if any.
+
+    Raises
+    ------
+    `ValueError`
+        If `update_rate` isn't positive.
+    """
+    pos: Vector2
+    size: Vector2
+    center: Vector2
+    world_width: float
+    _: KW_ONLY
+    update_rate: Optional[float] = 10
+    background: Optional[Color] = field(default_factory=lambda: Color(0, 0, 0))
+    border_color: Optional[Color] = None
+
+    _surface: Optional[Surface] = field(default=None, init=False, repr=False)
+    _last_update: float = field(default=float('-inf'), init=False, repr=False)
+
+    # simplified draws by renderable type. renderables without one aren't drawn in viewports.
+    _draws: ClassVar[dict[type, SimplifiedDraw]] = {}
+    # the draw used for each type drawn so far, which may be a base class's
+    _resolved: ClassVar[dict[type, Optional[SimplifiedDraw]]] = {}
+
+    @classmethod
+    def register_draw(cls, renderable_type: Type[RenderableT], draw: SimplifiedDraw[RenderableT]) -> None:
+        """
+        Sets how a type of renderable (and its subclasses) is drawn in viewports.\n
+        The function receives the viewport, the renderable and the surface to draw on, and is
+        responsible for its own culling (see `world_to_pixel_xy` and `world_to_pixel_scale`).
+        """
+        cls._draws[renderable_type] = draw
+        cls._resolved.clear()
+
+    def __post_init__(self) -> None:
+        if self.update_rate is not None and self.update_rate <= 0:
+            raise ValueError(f'The update rate must be positive or None, not {self.update_rate}!')
+
+    def __getstate__(self) -> dict[str, Any]:
+        # surfaces can't be pickled (e.g. by `Game.save_snapshot`), so the image is drawn again
+        # after loading
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        del state['_surface'], state['_last_update']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+        self._surface = None
+        self._last_update = float('-inf')
+
+    @property
+    def scale(self) -> float:
+        """
+        How many pixels a world unit takes in the viewport.
+        """
+        return self.size.x / self.world_width
+
+    @property
+    def surface(self) -> Optional[Surface]:
+        """
+        The last image drawn, `None` if it hasn't been drawn yet.
+        """
+        return self._surface
+
+    def world_to_pixel_xy(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Converts a position in world units to pixels within the viewport's image, like
+        `Camera.world_to_pixel_xy` does for the window.
+        """
+        scale = self.size.x / self.world_width
+        return (x - self.center.x) * scale + self.size.x / 2, (self.center.y - y) * scale + self.size.y / 2
+
+    def world_to_pixel_scale(self, scale: float) -> float:
+        """
+        Converts a size (e.g. a radius) in world units to pixels within the viewport's image, like
+        `Camera.world_to_pixel_scale` does for the window.
+        """
+        return scale * self.size.x / self.world_width * _SIZE_SCALE
+
+    def refresh(self) -> None:
+        """
+        Makes the viewport draw its image again next frame, regardless of its update rate.
+        """
+        self._last_update = float('-inf')
+
+    def draw(self) -> None:
+        now = perf_counter()
+
+        if self.update_rate is None or now - self._last_update >= 1 / self.update_rate:
+            self._last_update = now
+            self._update()
+
+        assert self._surface is not None
+        surface = self._game.window.surface
+        surface.blit(self._surface, self.pos)
+
+        if self.border_color is not None:
+            pygame.draw.rect(surface, self.border_color, Rect(self.pos, self._surface.get_size()), 1)
+
+    def _update(self) -> None:
+        surface = self._prepare_surface()
+        drawn = 0
+
+        for renderable in self._game.rendering.renderables:
+            draw = self._find_draw(type(renderable))
+
+            if draw is not None:
+                draw(self, renderable, surface)
+                drawn += 1
+
+        if self._game.profiler is not None:
+            self._game.profiler.count('viewport_updates', 1)
+            self._game.profiler.count('viewport_draws', drawn)
+
+    def _prepare_surface(self) -> Surface:
+        """
+        Returns the surface to draw the image on, cleared, which is created if it doesn't exist
+        yet (e.g. after loading a snapshot) or `size` changed.
+        """
+        size = (int(self.size.x), int(self.size.y))
+
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = Surface(size, pygame.SRCALPHA)
+
+        if self.background is None:
+            self._surface.fill((0, 0, 0, 0))
+        else:
+            self._surface.fill(self.background)
+
+        return self._surface
+
+    @classmethod
+    def _find_draw(cls, renderable_type: type) -> Optional[SimplifiedDraw]:
+        try:
+            return cls._resolved[renderable_type]
+        except KeyError:
+            pass
+
+        # the draw of the type itself or of its closest registered base class
+        draw = next((cls._draws[base] for base in renderable_type.__mro__ if base in cls._draws), None)
+        cls._resolved[renderable_type] = draw
+
+        return draw
+
+
+def _count_cull(viewport: Viewport) -> None:
+    if viewport._game.profiler is not None:
+        viewport._game.profiler.count('culls', 1)
+
+
+def _draw_circle(viewport: Viewport, circle: Circle, surface: Surface) -> None:
+    x, y = viewport.world_to_pixel_xy(circle.pos.x, circle.pos.y)
+    radius = viewport.world_to_pixel_scale(circle.radius)
+    width, height = surface.get_size()
+
+    if x < -radius or y < -radius or x >= width + radius or y >= height + radius:
+        _count_cull(viewport)
+        return
+
+    color = circle.fill_color if circle.fill_color is not None else circle.stroke_color
+
+    if color is None:
+        return
+
+    # anything smaller than a couple of pixels is a single pixel, and nothing is antialiased
+    if radius < 1.5:
+        if 0 <= x < width and 0 <= y < height:
+            surface.set_at((int(x), int(y)), color)
+    elif circle.fill_color is not None:
+        pygame.draw.circle(surface, color, (x, y), radius)
+    else:
+        pygame.draw.circle(surface, color, (x, y), radius, 1)
+
+
+def _draw_rectangle(viewport: Viewport, rectangle: Rectangle, surface: Surface) -> None:
+    x, y = viewport.world_to_pixel_xy(rectangle.pos.x, rectangle.pos.y)
+    width = viewport.world_to_pixel_scale(rectangle.width)
+    height = viewport.world_to_pixel_scale(rectangle.height)
+    rect = Rect(0, 0, max(1, round(width)), max(1, round(height)))
+
+    if rectangle.rect_mode == 'center':
+        rect.center = int(x), int(y)
+    else:
+        rect.topleft = int(x), int(y)
+
+    if not rect.colliderect(surface.get_rect()):
+        _count_cull(viewport)
+        return
+
+    if rectangle.fill_color is not None:
+        surface.fill(rectangle.fill_color, rect)
+    elif rectangle.stroke_color is not None:
+        pygame.draw.rect(surface, rectangle.stroke_color, rect, 1)
+
+
+Viewport.register_draw(Circle, _draw_circle)
+Viewport.register_draw(Rectangle, _draw_rectangle)
@@ -8,6 +8,8 @@ game = Game()
 mouse = Circle(game, game.mouse.pos, 0.1, Color(255, 0, 0), antialiasing=False)
 mouse.always_render = True
 mouse.layer = 2
+# sampled right before rendering instead of during the update, so the cursor doesn't lag behind
+game.rendering.late_latch(mouse, game.mouse.live_pos)
 
 
 def shrink() -> Coroutine:
@@ -18,11 +20,6 @@ def shrink() -> Coroutine:
         yield None
 
 
-@game.on_update
-def update() -> None:
-    mouse.pos = game.mouse.pos
-
-
 @game.keyboard.on_key_down
 def key_down(key: Key) -> None:
     match key:
@@ -37,7 +34,12 @@ def key_down(key: Key) -> None:
 game.window.fullscreen = True
 game.mouse.visible = False
 
-game.add_component(Player)
+controls = InputMap(game)
+controls.axis('horizontal', Key.a, Key.d)
+controls.axis('vertical', Key.s, Key.w)
+controls.action('sprint', Key.left_shift)
+
+game.add_component(Player(game, controls))
 game.scheduling.start_coroutine(shrink())
 
 game.mainloop()
@@ -2,11 +2,14 @@ from bpgwrapper import *
 
 
 class Player(Component):
-    def __init__(self, game: 'Game') -> None:
+    def __init__(self, game: 'Game', controls: InputMap) -> None:
         super().__init__(game)
 
         self.pos = Vector2()
 
+        # shared rather than created here, since maps run until they're removed from the game
+        self.controls = controls
+
         self.circle = Circle(self._game, Vector2(), 1, Color('#2B59C3'))
         self.circle.always_render = True
         self.circle.pos = self.pos
@@ -15,15 +18,15 @@ class Player(Component):
     @property
     def movement(self) -> Vector2:
         movement = Vector2(
-            self._game.keyboard.get_axis(Key.a, Key.d),
-            self._game.keyboard.get_axis(Key.s, Key.w),
+            self.controls.state.horizontal,
+            self.controls.state.vertical,
         )
 
         return normalize_vec2_if_possible(movement) * self.speed * self._game.time.deltatime
 
     @property
     def speed(self) -> float:
-        return 8 if self._game.keyboard.get_key_pressed(Key.left_shift) else 4
+        return 8 if self.controls.state.sprint else 4
 
     def update(self) -> None:
         self.pos += self.movement
@@ -0,0 +1,5 @@
+import os
+
+# the tests don't need a real display or audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
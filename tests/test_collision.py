@@ -0,0 +1,50 @@
+from pygame.math import Vector2
+
+from bpgwrapper import Game
+from bpgwrapper._systems import CircleCollider
+
+
+def overlapping_circles(game: Game, count: int) -> list[CircleCollider]:
+    return [game.collision.add(CircleCollider(Vector2(i / 2, 0), 1)) for i in range(count)]
+
+
+def test_remove_in_on_enter() -> None:
+    game = Game(systems=['collision'])
+    overlapping_circles(game, 3)
+    removed = []
+
+    @game.collision.on_enter
+    def on_enter(a: CircleCollider, b: CircleCollider) -> None:
+        # pairs with a collider that was removed by an earlier handler aren't dispatched
+        assert a not in removed and b not in removed
+        removed.append(b)
+        game.collision.remove(b)
+
+    game.step()
+
+    assert removed
+    assert all(collider not in removed for collider in game.collision.colliders)
+
+
+def test_remove_in_on_exit() -> None:
+    game = Game(systems=['collision'])
+    circles = overlapping_circles(game, 3)
+    game.step()
+
+    for circle in circles:
+        circle.pos.y = circles.index(circle) * 10
+
+    exited = []
+
+    @game.collision.on_exit
+    def on_exit(a: CircleCollider, b: CircleCollider) -> None:
+        exited.append({a, b})
+
+        for collider in (a, b):
+            game.collision.remove(collider)
+
+    game.step()
+
+    assert not game.collision.colliders
+    # each pair is only reported once, either by `update` or by `remove`
+    assert len(exited) == len({frozenset(pair) for pair in exited})
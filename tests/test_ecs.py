@@ -0,0 +1,60 @@
+import pytest
+
+from bpgwrapper import Game
+
+np = pytest.importorskip('numpy')
+
+from bpgwrapper.ecs import World
+
+
+def make_world() -> World:
+    world = World(Game(systems=[]))
+    world.register('pos', np.float32, (2,))
+    world.register('vel', np.float32, (2,))
+    world.register('tag', np.int32)
+    return world
+
+
+def test_structural_changes_during_query_are_deferred() -> None:
+    world = make_world()
+    entities = world.spawn_many(4, pos=0, vel=1)
+    spawned = []
+
+    for pos, vel in world.query('pos', 'vel'):
+        # enough new entities to make the archetype reallocate its columns
+        spawned.extend(world.spawn_many(1000, pos=5, vel=1).tolist())
+        world.set(int(entities[0]), 'tag', 7)
+        world.remove(int(entities[1]), 'vel')
+        world.despawn(int(entities[2]))
+
+        # the views still point at the columns the entities are in
+        pos += vel
+        assert len(world) == 4
+
+    assert len(world) == 4 + 1000 - 1
+    assert world.get(int(entities[0]), 'tag') == 7
+    assert world.get(int(entities[0]), 'pos').tolist() == [1, 1]
+    assert world.get(int(entities[1]), 'pos').tolist() == [1, 1]
+    assert int(entities[2]) not in world
+    assert world.get(spawned[0], 'pos').tolist() == [5, 5]
+
+
+def test_structural_changes_in_systems_are_deferred() -> None:
+    world = make_world()
+    entities = world.spawn_many(3, pos=0, vel=1)
+
+    @world.system('pos', 'vel')
+    def move(pos: 'np.ndarray', vel: 'np.ndarray') -> None:
+        world.despawn(int(entities[0]))
+        # changes to entities that are despawned first are dropped
+        world.set(int(entities[0]), 'tag', 1)
+        new = world.spawn(pos=(9, 9), vel=(0, 0))
+        world.set(new, 'tag', 3)
+        pos += vel
+        assert len(world) == 3
+
+    world.update()
+
+    assert int(entities[0]) not in world
+    assert world.get(int(entities[1]), 'pos').tolist() == [1, 1]
+    assert world.get(3, 'tag') == 3
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+from pygame.color import Color
+from pygame.math import Vector2
+
+from bpgwrapper import Circle, Game
+
+np = pytest.importorskip('numpy')
+
+from bpgwrapper.tilemap import Tilemap
+from bpgwrapper.viewports import Viewport
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    game = Game(systems=['rendering', 'collision'])
+    red = Color('red')
+
+    for i in range(100):
+        Circle(game, Vector2(i, -i), 1 + i % 3, red if i % 2 else Color(i, 0, 0)).always_render = True
+
+    game.step()
+    game.save_snapshot(tmp_path / 'game.snap')
+
+    loaded = Game(systems=['rendering', 'collision'])
+    loaded.load_snapshot(tmp_path / 'game.snap')
+
+    assert [(tuple(c.pos), c.radius, c.fill_color) for c in loaded.rendering.renderables] == \
+        [(tuple(c.pos), c.radius, c.fill_color) for c in game.rendering.renderables]
+    # shared colors stay shared
+    assert loaded.rendering.renderables[1].fill_color is loaded.rendering.renderables[3].fill_color
+
+
+def test_drawn_renderables_with_surfaces(tmp_path: Path) -> None:
+    # tilemaps and viewports hold surfaces once they've been drawn, which can't be pickled
+    game = Game(systems=['rendering'])
+    tilemap = Tilemap(game, np.arange(16 * 16).reshape(16, 16) % 2, [Color('green'), Color('blue')], Vector2())
+    tilemap.always_render = True
+    viewport = Viewport(game, Vector2(), Vector2(32, 24), Vector2(), 10)
+    viewport.always_render = True
+
+    game.step()
+    game.step()
+    game.save_snapshot(tmp_path / 'game.snap')
+
+    loaded = Game(systems=['rendering'])
+    loaded.load_snapshot(tmp_path / 'game.snap')
+    loaded_tilemap, loaded_viewport = loaded.rendering.renderables
+
+    assert (loaded_tilemap.tiles == tilemap.tiles).all()
+    assert loaded_viewport.size == viewport.size
+
+    # and they can still be drawn
+    loaded.step()
+    assert loaded_viewport.surface.get_size() == (32, 24)